@@ -1,15 +1,28 @@
+import base64
 import boto3
+import paramiko
 import json
-import uuid
 import os
+import re
 import time
 import socket
 import subprocess
 import shlex
+from secrets import token_hex
+import functools
+import shutil
+import mimetypes
+import gzip
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from .config import load_bucket_config, CONFIG_FILE
+from .config import load_bucket_config, CONFIG_FILE, REGION
 
-REGION = "ap-south-1"
 KEY_PATH = os.path.join(os.path.dirname(__file__), "livanshu-kp.pem")
 if os.path.isfile(KEY_PATH):
     os.chmod(KEY_PATH, 0o400)
@@ -17,13 +30,109 @@ else:
     raise FileNotFoundError(f"SSH key not found at {KEY_PATH}")
 
 REMOTE_USER = "ec2-user"
+SFTP_WINDOW_SIZE = 2 ** 27
+SFTP_MAX_PACKET_SIZE = 2 ** 15
+
+DEFAULT_AMI_ID = "ami-0b09627181c8d5778"
+# AMI with docker already installed; skips the package install on first boot
+DOCKER_AMI_ID = os.environ.get("DEPLOY_TOOL_DOCKER_AMI")
+
+INSTALL_DOCKER_USER_DATA = """#!/bin/bash
+exec > /var/log/user-data.log 2>&1
+
+yum update -y
+yum install -y docker
+
+systemctl start docker
+systemctl enable docker
+
+usermod -aG docker ec2-user
+
+sleep 15
+
+docker info || (echo "Docker failed to start" && exit 1)
+
+echo " Docker is ready"
+"""
+
+START_DOCKER_USER_DATA = """#!/bin/bash
+exec > /var/log/user-data.log 2>&1
+
+systemctl start docker
+
+docker info || (echo "Docker failed to start" && exit 1)
+
+echo " Docker is ready"
+"""
+
+ARTIFACT_BUCKET_FILE = "artifact_bucket.txt"
+ARTIFACT_URL_EXPIRY = 3600
+ARTIFACT_TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=10)
+
+ECR_REPOSITORY_FILE = "ecr_repository.txt"
+APP_PORT_MAPPING = "80:3000"
+
+UPLOAD_WORKERS = 32
+# Client-side rate limiting plus backoff for throttling and eventual-consistency errors
+ADAPTIVE_RETRIES = {'mode': 'adaptive', 'max_attempts': 10}
+GZIP_CONTENT_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+# Bundler output that never changes in place: a hex hash of 8+ characters (CRA, Angular:
+# main.1a2b3c4d.js, main.1a2b3c4d.chunk.js) or Vite's 8-character token with both a digit
+# and a letter (index-BkJ3xY9_.js). The hash is one token right before the extension, so
+# service-worker-v2.js, my-component-v10.js and font-awesome-4.7.0.woff2 don't count.
+HASHED_ASSET_PATTERN = re.compile(
+    r'[.-](?:[0-9a-f]{8,}|(?=[A-Za-z0-9_]*\d)(?=[A-Za-z0-9_]*[A-Za-z])[A-Za-z0-9_]{8})(\.\w+)+$'
+)
+# Compressed bodies stay in memory up to this size, larger ones spill to a temp file
+GZIP_SPOOL_SIZE = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# A single session loads the botocore service models once for every client below.
+# Sessions aren't thread-safe, so clients are created under a lock.
+_SESSION = boto3.session.Session()
+_session_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def get_ecr_client(region=REGION):
+    with _session_lock:
+        return _SESSION.client('ecr', region_name=region)
+
+@functools.lru_cache(maxsize=None)
+def get_ec2_resource(region=REGION):
+    with _session_lock:
+        return _SESSION.resource('ec2', region_name=region, config=Config(retries=ADAPTIVE_RETRIES))
+
+@functools.lru_cache(maxsize=None)
+def get_ssm_client(region=REGION):
+    with _session_lock:
+        return _SESSION.client('ssm', region_name=region)
+
+# One client per region, shared across calls and upload threads
+@functools.lru_cache(maxsize=None)
+def get_s3_client(region=REGION):
+    # Regional endpoint + virtual addressing so presigned URLs work on freshly created buckets
+    with _session_lock:
+        return _SESSION.client(
+            's3',
+            region_name=region,
+            endpoint_url=f"https://s3.{region}.amazonaws.com",
+            config=Config(
+                max_pool_connections=UPLOAD_WORKERS,
+                retries=ADAPTIVE_RETRIES,
+                s3={'addressing_style': 'virtual'}
+            )
+        )
 
 def generate_unique_bucket_name(prefix="static-site"):
-    suffix = str(uuid.uuid4())[:8]
-    return f"{prefix}-{suffix}"
+    return f"{prefix}-{token_hex(4)}"
 
-def create_public_s3_bucket(prefix, region= "ap-south-1"):
-    s3 = boto3.client('s3', region_name=REGION)
+def create_public_s3_bucket(prefix, region=REGION):
+    s3 = get_s3_client()
     bucket_name = generate_unique_bucket_name(prefix)
 
     try:
@@ -44,25 +153,27 @@ def create_public_s3_bucket(prefix, region= "ap-south-1"):
             }]
         }
 
-        s3.put_public_access_block(
-            Bucket=bucket_name,
-            PublicAccessBlockConfiguration={
-                'BlockPublicAcls': False,
-                'IgnorePublicAcls': False,
-                'BlockPublicPolicy': False,
-                'RestrictPublicBuckets': False
-            }
-        )
-
-        s3.put_bucket_policy(Bucket=bucket_name, Policy=json.dumps(policy))
-
-        s3.put_bucket_website(
-            Bucket=bucket_name,
-            WebsiteConfiguration={
-                'IndexDocument': {'Suffix': 'index.html'},
-                'ErrorDocument': {'Key': 'index.html'}
-            }
-        )
+        def grant_public_read():
+            # New buckets block public policies, so the access block must be lifted first
+            s3.put_public_access_block(
+                Bucket=bucket_name,
+                # Public reads come from the bucket policy alone, so ACLs can stay blocked
+                PublicAccessBlockConfiguration={
+                    'BlockPublicAcls': True,
+                    'IgnorePublicAcls': True,
+                    'BlockPublicPolicy': False,
+                    'RestrictPublicBuckets': False
+                }
+            )
+            s3.put_bucket_policy(Bucket=bucket_name, Policy=json.dumps(policy))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(grant_public_read),
+                executor.submit(enable_static_website, bucket_name),
+            ]
+            for future in futures:
+                future.result()
         print("Public read access granted.")
         return bucket_name
 
@@ -71,15 +182,102 @@ def create_public_s3_bucket(prefix, region= "ap-south-1"):
         return None
 
 def upload_to_s3(build_dir, bucket_name):
-    s3 = boto3.client('s3')
-    for root, dirs, files in os.walk(build_dir):
-        for file in files:
-            local_path = os.path.join(root, file)
-            relative_path = os.path.relpath(local_path, build_dir)
-            s3.upload_file(local_path, bucket_name, relative_path)
+    try:
+        upload_files_concurrently(build_dir, bucket_name)
+    except (ClientError, S3UploadFailedError) as e:
+        raise RuntimeError(f"S3 upload failed: {e}") from e
+
+def gzip_file(local_path):
+    spool = tempfile.SpooledTemporaryFile(max_size=GZIP_SPOOL_SIZE)
+    # mtime=0 keeps the output byte-identical across runs
+    with open(local_path, 'rb') as src, gzip.GzipFile(fileobj=spool, mode='wb', compresslevel=6, mtime=0) as gz:
+        shutil.copyfileobj(src, gz)
+    spool.seek(0)
+    return spool
+
+def md5_hexdigest(fileobj):
+    digest = hashlib.md5()
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+def list_remote_objects(s3, bucket_name):
+    """Map each key in the bucket to its (etag, size)."""
+    objects = {}
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name):
+        for obj in page.get('Contents', []):
+            objects[obj['Key']] = (obj['ETag'].strip('"'), obj['Size'])
+    return objects
+
+def fileobj_size(fileobj):
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(0)
+    return size
+
+def iter_files(root, prefix=""):
+    # scandir entries carry their type from readdir, so directories are told apart without a stat per file
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path, f"{prefix}{entry.name}/")
+            elif entry.is_file():
+                yield entry.path, prefix + entry.name
+
+def upload_files_concurrently(build_dir, bucket_name):
+    s3 = get_s3_client()
+    pairs = list(iter_files(build_dir))
+
+    if not pairs:
+        return
+
+    # Single-part ETags are the MD5 of the stored bytes, so unchanged files can be skipped
+    remote_objects = list_remote_objects(s3, bucket_name)
+
+    def upload(pair):
+        local_path, key = pair
+        content_type = mimetypes.guess_type(local_path)[0] or "application/octet-stream"
+        # Only content-hashed bundles are safe to cache for a year; index.html, manifests,
+        # favicons and service workers keep their names across deploys, so revalidate them
+        if HASHED_ASSET_PATTERN.search(os.path.basename(key)):
+            cache_control = "public,max-age=31536000,immutable"
+        else:
+            cache_control = "no-cache"
+        extra_args = {'ContentType': content_type, 'CacheControl': cache_control}
+
+        if content_type.startswith(GZIP_CONTENT_TYPES):
+            extra_args['ContentEncoding'] = 'gzip'
+            body = gzip_file(local_path)
+        else:
+            body = open(local_path, 'rb')
+
+        with body:
+            remote_etag, remote_size = remote_objects.get(key, (None, None))
+            # A size mismatch already proves a change, so only equal sizes are hashed
+            if remote_size == fileobj_size(body) and remote_etag == md5_hexdigest(body):
+                return False
+            s3.upload_fileobj(body, bucket_name, key, Config=TRANSFER_CONFIG, ExtraArgs=extra_args)
+            return True
+
+    # Like `aws s3 sync --delete`: drop objects the new build no longer contains
+    local_keys = {key for _, key in pairs}
+    stale_keys = [key for key in remote_objects if key not in local_keys]
+    stale_batches = [stale_keys[i:i + 1000] for i in range(0, len(stale_keys), 1000)]
+
+    def delete_batch(keys):
+        s3.delete_objects(
+            Bucket=bucket_name,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        )
+
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(pairs))) as executor:
+        uploaded = sum(executor.map(upload, pairs))
+        list(executor.map(delete_batch, stale_batches))
+    print(f"Uploaded {uploaded} files, {len(pairs) - uploaded} unchanged, {len(stale_keys)} removed.")
 
 def enable_static_website(bucket_name):
-    s3 = boto3.client('s3')
+    s3 = get_s3_client()
     s3.put_bucket_website(
         Bucket=bucket_name,
         WebsiteConfiguration={
@@ -92,7 +290,7 @@ def get_website_url(bucket, region):
     return f"http://{bucket}.s3-website.{region}.amazonaws.com"
 
 def provision_ec2_with_docker(environment):
-    ec2 = boto3.resource('ec2', region_name=REGION)
+    ec2 = get_ec2_resource()
 
     sg = ec2.create_security_group(
         GroupName=f"{environment}-sg",
@@ -114,36 +312,20 @@ def provision_ec2_with_docker(environment):
         }
     ])
 
-    user_data =  """#!/bin/bash
-exec > /var/log/user-data.log 2>&1
-
-yum update -y
-yum install -y unzip docker
-
-systemctl start docker
-systemctl enable docker
-
-usermod -aG docker ec2-user
-
-sleep 15
-
-docker info || (echo "Docker failed to start" && exit 1)
-
-echo " Docker is ready"
-"""
-
     instance = ec2.create_instances(
-        ImageId='ami-0b09627181c8d5778',
+        ImageId=DOCKER_AMI_ID or DEFAULT_AMI_ID,
         InstanceType='t2.micro',
         MinCount=1,
         MaxCount=1,
         KeyName='livanshu-kp',
         SecurityGroupIds=[sg.id],
-        UserData=user_data
+        UserData=START_DOCKER_USER_DATA if DOCKER_AMI_ID else INSTALL_DOCKER_USER_DATA
     )[0]
 
     print(" Waiting for EC2 instance to initialize...")
-    instance.wait_until_running()
+    # The resource waiter polls every 15s; poll every 2s so we move on as soon as it's running
+    waiter = ec2.meta.client.get_waiter('instance_running')
+    waiter.wait(InstanceIds=[instance.id], WaiterConfig={'Delay': 2, 'MaxAttempts': 90})
     instance.reload()
 
     with open("ec2_instance_id.txt", "w") as f:
@@ -158,20 +340,28 @@ echo " Docker is ready"
 def wait_for_ssh(ip, port=22, timeout=300):
     print("Waiting for SSH to become available...")
     start_time = time.time()
+    attempt = 0
     while True:
         try:
             with socket.create_connection((ip, port), timeout=5):
                 print("SSH is ready!")
                 return
-        except (socket.timeout, ConnectionRefusedError, OSError):
-            if time.time() - start_time > timeout:
-                raise TimeoutError("Timed out waiting for SSH.")
-            print("Still waiting for SSH...")
-            time.sleep(5)
+        except socket.timeout:
+            # The connect timeout already paced this attempt
+            delay = 0
+        except OSError:
+            # Refused/unreachable fails instantly, so back off 0.5s, 1s, 2s ... up to 5s
+            delay = min(5, 0.5 * 2 ** attempt)
+        if time.time() - start_time > timeout:
+            raise TimeoutError("Timed out waiting for SSH.")
+        print("Still waiting for SSH...")
+        attempt += 1
+        time.sleep(delay)
 
 def wait_for_docker(ip, timeout=120):
     print(" Waiting for Docker to be ready...")
-    for _ in range(timeout // 5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
         result = subprocess.run(
             [
                 "ssh",
@@ -188,32 +378,80 @@ def wait_for_docker(ip, timeout=120):
         if "Docker version" in result.stdout:
             print(f"Docker is ready: {result.stdout.strip()}")
             return
-        time.sleep(5)
+        time.sleep(2)
     raise Exception("Docker did not become ready in time.")
 
-def upload_file(ip, local_path, remote_path="app.zip"):
+def upload_file(ip, local_path, remote_path="app.tar.gz"):
     print(f"Uploading {local_path} to EC2...")
-    result = subprocess.run(
-        [
-            "scp",
-            "-i", KEY_PATH,
-            "-o", "StrictHostKeyChecking=no",
-            "-o", "UserKnownHostsFile=/dev/null",
-            local_path,
-            f"{REMOTE_USER}@{ip}:{remote_path}"
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    if result.returncode != 0:
-        print(result.stderr)
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            ip,
+            username=REMOTE_USER,
+            key_filename=KEY_PATH,
+            look_for_keys=False,
+            allow_agent=False
+        )
+        # Large window + pipelined writes keep the link busy instead of waiting on per-chunk acks
+        sftp = paramiko.SFTPClient.from_transport(
+            client.get_transport(),
+            window_size=SFTP_WINDOW_SIZE,
+            max_packet_size=SFTP_MAX_PACKET_SIZE
+        )
+        try:
+            sftp.put(local_path, remote_path)
+        finally:
+            sftp.close()
+    except (paramiko.SSHException, OSError) as e:
+        print(e)
         raise RuntimeError("Failed to upload file.")
-    else:
-        print("File uploaded.")
+    finally:
+        client.close()
+    print("File uploaded.")
 
 
-def run_ssh_command(ip, command):
+def get_artifact_bucket():
+    if os.path.exists(ARTIFACT_BUCKET_FILE):
+        with open(ARTIFACT_BUCKET_FILE) as f:
+            return f.read().strip()
+
+    s3 = get_s3_client()
+    bucket_name = generate_unique_bucket_name("deploy-artifacts")
+    s3.create_bucket(
+        Bucket=bucket_name,
+        CreateBucketConfiguration={'LocationConstraint': REGION}
+    )
+    with open(ARTIFACT_BUCKET_FILE, "w") as f:
+        f.write(bucket_name)
+    print(f"Artifact bucket '{bucket_name}' created in '{REGION}'")
+    return bucket_name
+
+# Stage the archive in S3 and let the instance pull it over the AWS backbone through
+# a presigned URL (no instance role needed). Falls back to SFTP if any step fails.
+def deliver_archive(ip, local_path, remote_path="app.tar.gz"):
+    try:
+        s3 = get_s3_client()
+        bucket_name = get_artifact_bucket()
+        key = os.path.basename(local_path)
+        print(f"Staging {local_path} in s3://{bucket_name}...")
+        s3.upload_file(local_path, bucket_name, key, Config=ARTIFACT_TRANSFER_CONFIG)
+        url = s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket_name, 'Key': key},
+            ExpiresIn=ARTIFACT_URL_EXPIRY
+        )
+        run_ssh_command(
+            ip,
+            f"curl -fsS -o {shlex.quote(remote_path)} {shlex.quote(url)}",
+            label=f"curl -o {remote_path} <presigned s3://{bucket_name}/{key}>"
+        )
+        print("File uploaded.")
+    except (ClientError, S3UploadFailedError, RuntimeError) as e:
+        print(f"S3 delivery failed ({e}), falling back to SFTP.")
+        upload_file(ip, local_path, remote_path)
+
+def run_ssh_command(ip, command, label=None, stdin_data=None):
     ssh_command = [
         "ssh",
         "-i", KEY_PATH,
@@ -223,57 +461,134 @@ def run_ssh_command(ip, command):
         command
     ]
 
-    print(f"Running: {command}")
+    print(f"Running: {label or command}")
     process = subprocess.Popen(
         ssh_command,
+        stdin=subprocess.PIPE if stdin_data is not None else None,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         encoding='utf-8',
         errors='replace'
     )
 
+    if stdin_data is not None:
+        process.stdin.write(stdin_data)
+        process.stdin.close()
+
     for line in process.stdout:
         print(line, end="")
 
     process.wait()
     if process.returncode != 0:
-        raise RuntimeError(f"Command failed: {command}")
+        raise RuntimeError(f"Command failed: {label or command}")
 
 
 
 def run_commands(ip, commands):
-    for cmd in commands:
-        run_ssh_command(ip, cmd)
+    # One ssh session for the whole script instead of a handshake per command;
+    # && keeps the stop-on-first-failure behaviour
+    run_ssh_command(ip, " && ".join(commands))
 
-def upload_and_run_on_ec2(public_ip, zip_path, framework=None):
+def upload_and_run_on_ec2(public_ip, archive_path, framework=None):
     print(f"Starting deployment to EC2 {public_ip}...")
 
     wait_for_ssh(public_ip)
-    wait_for_docker(public_ip)
-    upload_file(public_ip, zip_path)
+    # The upload only needs sshd, so ship the archive while Docker finishes installing
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upload = executor.submit(deliver_archive, public_ip, archive_path)
+        wait_for_docker(public_ip)
+        upload.result()
 
     commands = [
         "sudo systemctl start docker",
         "while ! sudo docker info > /dev/null 2>&1; do echo ' Waiting for Docker daemon to start...'; sleep 2; done",
-        "sudo unzip -o app.zip -d app",
+        "sudo mkdir -p app && sudo tar -xzf app.tar.gz -C app",
         "cd app && sudo docker build -t myapp .",
-        "sudo docker run -d -p 80:3000 myapp"
+        f"sudo docker run -d -p {APP_PORT_MAPPING} myapp"
     ]
     run_commands(public_ip, commands)
 
     print(f"Deployment complete! App should be live at: http://{public_ip}")
 
 
+# Build the app image on the developer machine and push it to ECR, so the instance
+# only has to pull it. Returns (image_uri, registry, password) for run_image_on_ec2.
+def push_image_to_ecr(context_dir, environment):
+    ecr = get_ecr_client()
+    repository = f"deploy-tool-{environment}".lower()
+    try:
+        repo = ecr.create_repository(repositoryName=repository)['repository']
+    except ecr.exceptions.RepositoryAlreadyExistsException:
+        repo = ecr.describe_repositories(repositoryNames=[repository])['repositories'][0]
+    with open(ECR_REPOSITORY_FILE, "w") as f:
+        f.write(repository)
+
+    auth = ecr.get_authorization_token()['authorizationData'][0]
+    _, password = base64.b64decode(auth['authorizationToken']).decode().split(':', 1)
+    registry = auth['proxyEndpoint']
+    image_uri = f"{repo['repositoryUri']}:latest"
+
+    login = subprocess.run(
+        ["docker", "login", "--username", "AWS", "--password-stdin", registry],
+        input=password, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    if login.returncode != 0:
+        print(login.stderr)
+        raise RuntimeError("docker login to ECR failed.")
+
+    print(f"Building and pushing {image_uri}...")
+    build = subprocess.run(
+        ["docker", "buildx", "build", "--platform=linux/amd64", "-t", image_uri, "--push", context_dir]
+    )
+    if build.returncode != 0:
+        raise RuntimeError("docker build/push failed.")
+    return image_uri, registry, password
+
+def run_image_on_ec2(public_ip, image_uri, registry, password):
+    print(f"Starting deployment to EC2 {public_ip}...")
+
+    wait_for_ssh(public_ip)
+    wait_for_docker(public_ip)
+
+    run_commands(public_ip, [
+        "sudo systemctl start docker",
+        "while ! sudo docker info > /dev/null 2>&1; do echo ' Waiting for Docker daemon to start...'; sleep 2; done",
+    ])
+    run_ssh_command(
+        public_ip,
+        f"sudo docker login --username AWS --password-stdin {registry}",
+        stdin_data=password
+    )
+    run_commands(public_ip, [
+        f"sudo docker pull {image_uri}",
+        f"sudo docker run -d -p {APP_PORT_MAPPING} {image_uri}"
+    ])
+
+    print(f"Deployment complete! App should be live at: http://{public_ip}")
+
+
 def delete_s3_bucket(bucket_name):
-    s3 = boto3.resource("s3", region_name=REGION)
-    bucket = s3.Bucket(bucket_name)
-    for obj in bucket.objects.all():
-        obj.delete()
-    bucket.delete()
+    s3 = get_s3_client()
+    paginator = s3.get_paginator("list_objects_v2")
+
+    def delete_page(objects):
+        s3.delete_objects(Bucket=bucket_name, Delete={'Objects': objects, 'Quiet': True})
+
+    # list_objects_v2 pages hold at most 1000 keys, which is also the delete_objects limit
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = []
+        for page in paginator.paginate(Bucket=bucket_name):
+            objects = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if objects:
+                futures.append(executor.submit(delete_page, objects))
+        for future in futures:
+            future.result()
+
+    s3.delete_bucket(Bucket=bucket_name)
     print(f"Deleted bucket: {bucket_name}")
 
 def rollback_all_resources():
-    ec2 = boto3.resource("ec2", region_name=REGION)
+    ec2 = get_ec2_resource()
 
     if os.path.exists("ec2_instance_id.txt"):
         with open("ec2_instance_id.txt") as f:
@@ -294,10 +609,28 @@ def rollback_all_resources():
         os.remove("security_group_id.txt")
         print("Security group deleted.")
 
+    if os.path.exists(ECR_REPOSITORY_FILE):
+        with open(ECR_REPOSITORY_FILE) as f:
+            repository = f.read().strip()
+        print(f"Deleting ECR repository: {repository}")
+        get_ecr_client().delete_repository(repositoryName=repository, force=True)
+        os.remove(ECR_REPOSITORY_FILE)
+
+    if os.path.exists(ARTIFACT_BUCKET_FILE):
+        with open(ARTIFACT_BUCKET_FILE) as f:
+            artifact_bucket = f.read().strip()
+        delete_s3_bucket(artifact_bucket)
+        os.remove(ARTIFACT_BUCKET_FILE)
+
     state = load_bucket_config()
     if state:
-        delete_s3_bucket(state["bucket"])
-        print(f"Deleted S3 bucket: {state['bucket']}")
+        buckets = {state["bucket"]}
+        buckets.update(entry["bucket"] for entry in state.get("environments", {}).values())
+        for bucket in buckets:
+            try:
+                delete_s3_bucket(bucket)
+            except ClientError as e:
+                print(f"Could not delete S3 bucket {bucket}: {e}")
         CONFIG_FILE.unlink(missing_ok=True)
     else:
         print("No S3 bucket found to delete.")
\ No newline at end of file
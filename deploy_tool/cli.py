@@ -1,53 +1,67 @@
-import tempfile
 import click
-import json
+import functools
+import hashlib
 import os
+import re
 import shutil
+import signal
 import subprocess
-import platform
-import time
 import stat
+import sys
+import tarfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import boto3
-import requests
-from botocore.exceptions import ClientError
-from .config import load_config, save_config
-from .aws import rollback_all_resources
-
-
-from .aws import (
-    create_public_s3_bucket,
-    delete_s3_bucket,
-    enable_static_website,
-    get_website_url,
-    provision_ec2_with_docker,
-    upload_and_run_on_ec2,
+try:
+    import ijson
+except ImportError:
+    ijson = None
+from .config import (
+    REGION,
+    dump_json,
+    get_env_bucket_config,
+    load_bucket_config,
+    load_config,
+    read_json,
+    read_json_cached,
+    save_bucket_config,
+    save_config,
+    write_json,
 )
-
-CONFIG_FILE = Path("bucket.json")
+# boto3, paramiko and requests are imported where they are used, so --help and
+# simple commands don't pay for loading them
+
+BUILD_CACHE_DIR = Path.home() / ".deploy_tool" / "builds"
+# Each entry is a full copy of a build output; the least recently used are evicted
+BUILD_CACHE_SIZE = 10
+# Clones are kept between runs so redeploys only fetch new commits and reuse node_modules
+REPO_CACHE_DIR = Path.home() / ".deploy_tool" / "repos"
+
+# External programs each framework's deploy shells out to (git is always needed)
+REQUIRED_TOOLS = {
+    "react": ["npm"],
+    "react-vite": ["npm"],
+    "angular": ["npm", "ng"],
+    "nextjs": ["ssh"],
+}
+
+BUCKET_PREFIXES = {
+    "react": "site",
+    "react-vite": "react-vite-site",
+    "angular": "angular-site",
+}
 
 @click.group()
 def cli():
     """🛠️ CLI for deploying static sites to AWS S3"""
     pass
 
-# ----------------------
-# 🔧 Config Management
-# ----------------------
-
-def save_bucket_config(bucket_name, region="ap-south-1", environment=None):  # <--
-    """Persist the *last deployed* bucket (per env if provided)."""  # <--
-    data = {"bucket": bucket_name, "region": region}
-    if environment:  
-        data["env"] = environment  
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f)
-
-def load_bucket_config():
-    if CONFIG_FILE.exists():
-        with open(CONFIG_FILE) as f:
-            return json.load(f)
-    return None
+def require_tools(*tools):
+    """Check the tools are on PATH before any slow work starts; exits non-zero if any are missing."""
+    missing = [tool for tool in tools if shutil.which(tool) is None]
+    if missing:
+        raise click.ClickException(f"❌ Missing required tools: {', '.join(missing)}")
 
 # ----------------------
 # 📦 Init Command
@@ -57,13 +71,15 @@ def load_bucket_config():
 @click.argument('repo_url')
 def init(repo_url):
     """🔍 Initializes project by detecting framework and saving metadata."""
-    tmp_dir = tempfile.mkdtemp()
+    require_tools("git")
+    workspace = get_workspace(repo_url)
     click.echo(" Cloning repo...")
-    if not clone_repository(repo_url, tmp_dir):
+    if not clone_repository(repo_url, workspace, commit=get_remote_head(repo_url), manifests_only=True):
         click.echo("Failed to clone repository.")
         return
+    clear_scan_cache()
 
-    framework = detect_framework(tmp_dir)
+    framework, _, _ = detect_project(workspace)
     if not framework:
         click.echo("Framework not supported.")
         return
@@ -74,76 +90,181 @@ def init(repo_url):
     })
     click.echo(f"Detected framework: {framework}")
 
-
-    shutil.rmtree(tmp_dir, ignore_errors=True)
-
 # ----------------------
 # 🔍 Path Detector
 # ----------------------
 
-def find_react_project_path(root):
-    """Recursively search for the first folder containing a package.json with react."""
-    for dirpath, _, filenames in os.walk(root):
-        if 'package.json' in filenames:
-            try:
-                with open(os.path.join(dirpath, 'package.json')) as f:
-                    package_data = json.load(f)
-                    deps = package_data.get("dependencies", {})
-                    dev_deps = package_data.get("devDependencies", {})
-                    if "react" in deps or "react" in dev_deps:
-                        return dirpath
-            except Exception:
-                continue
-    return None
+# Dependency and build output folders never hold the project's own package.json.
+# Hidden folders (.git, .next, .angular, .cache, ...) are skipped by walk_pruned as well.
+SKIP_DIRS = {'node_modules', 'dist', 'build', 'out', 'coverage'}
+MAX_SCAN_DEPTH = 5
 
-def find_angular_project_path(root):
+def walk_pruned(root, max_depth=None):
+    """
+    Yield (dirpath, filenames) breadth-first, skipping SKIP_DIRS and hidden
+    folders, so shallow folders come out first and callers can stop at the
+    first match.
+    DirEntry caches the file type from readdir, so no extra stat per entry.
+    """
+    queue = deque([(root, 0)])
+    while queue:
+        dirpath, depth = queue.popleft()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        filenames = set()
+        descend = max_depth is None or depth < max_depth
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if descend and entry.name not in SKIP_DIRS and not entry.name.startswith('.'):
+                    queue.append((entry.path, depth + 1))
+            else:
+                filenames.add(entry.name)
+        yield dirpath, filenames
+
+# root -> detect_project result
+_project_cache = {}
+# Commit SHA -> [framework, project dir relative to the repo, build dir name]. A commit's
+# files never change, so entries don't expire; only the newest are kept.
+PROJECT_CACHE_FILE = Path.home() / ".deploy_tool" / "projects.json"
+PROJECT_CACHE_SIZE = 100
+# (path, mtime_ns, size) -> parsed package.json; survives clear_scan_cache, so files
+# left unchanged by a checkout are not parsed again
+_pkg_json_cache = {}
+
+# Below this size one bulk parse beats streaming
+STREAM_PARSE_MIN_SIZE = 64 * 1024
+DEPENDENCY_FIELDS = ('dependencies', 'devDependencies')
+
+def read_dependency_names(path):
+    """
+    Stream a large package.json with ijson and keep only the dependency names,
+    stopping as soon as both dependency maps have been read.
+    """
+    fields = {field: {} for field in DEPENDENCY_FIELDS}
+    remaining = set(DEPENDENCY_FIELDS)
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix not in fields:
+                continue
+            if event == 'map_key':
+                fields[prefix][value] = True
+            elif event == 'end_map':
+                remaining.discard(prefix)
+                if not remaining:
+                    break
+    return fields
+
+def load_package_json(path):
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _pkg_json_cache:
+        if ijson and st.st_size >= STREAM_PARSE_MIN_SIZE:
+            _pkg_json_cache[key] = read_dependency_names(path)
+        else:
+            _pkg_json_cache[key] = read_json(path)
+    return _pkg_json_cache[key]
 
-    for dirpath, _, filenames in os.walk(root):
+def iter_project_dirs(root):
+    """Yield (dirpath, package_data, filenames) for each folder holding a package.json or angular.json."""
+    for dirpath, filenames in walk_pruned(root, MAX_SCAN_DEPTH):
+        # angular.json alone settles the framework, so its package.json is never parsed
         if 'angular.json' in filenames:
-            return dirpath
-            
-        if 'package.json' in filenames:
+            yield dirpath, {}, filenames
+        elif 'package.json' in filenames:
             try:
-                with open(os.path.join(dirpath, 'package.json')) as f:
-                    package_data = json.load(f)
-                    deps = package_data.get("dependencies", {})
-                    dev_deps = package_data.get("devDependencies", {})
-
-                    angular_deps = ["@angular/core", "@angular/cli", "@angular/common", "angular"]
-                    
-                    for dep in angular_deps:
-                        if dep in deps or dep in dev_deps:
-                            return dirpath
-                            
+                package_data = load_package_json(f"{dirpath}{os.sep}package.json")
             except Exception:
                 continue
+            yield dirpath, package_data, filenames
+
+def clear_scan_cache():
+    _project_cache.clear()
+
+def package_deps(package_data):
+    deps = package_data.get("dependencies", {})
+    dev_deps = package_data.get("devDependencies", {})
+    return deps, dev_deps
+
+# Folder each static build writes to, relative to the project
+BUILD_DIR_NAMES = {
+    "react": "build",
+    "react-vite": "dist",
+    "angular": "dist",
+    "nextjs": None,
+}
+
+def classify_project(package_data, filenames):
+    deps, dev_deps = package_deps(package_data)
+
+    def has(name):
+        return name in deps or name in dev_deps
+
+    if 'angular.json' in filenames:
+        return "angular"
+    if has("next"):
+        return "nextjs"
+    if has("@angular/core"):
+        return "angular"
+
+    if has("react") and (has("vite") or has("@vitejs/plugin-react")):
+        return "react-vite"
+
+    if has("react"):
+        return "react"
     return None
 
+def detect_project(root):
+    """
+    Return (framework, project_path, build_dir_name) for the shallowest supported
+    project in the repo. The walk stops at the first match.
+    """
+    if root in _project_cache:
+        return _project_cache[root]
+
+    result = get_cached_project(root)
+    if result:
+        _project_cache[root] = result
+        return result
+
+    result = (None, None, None)
+    for dirpath, package_data, filenames in iter_project_dirs(root):
+        framework = classify_project(package_data, filenames)
+        if framework:
+            result = (framework, dirpath, BUILD_DIR_NAMES[framework])
+            cache_project(root, result)
+            break
+    _project_cache[root] = result
+    return result
+
+def get_cached_project(root):
+    """detect_project's result for the commit checked out in root, if a previous run stored it."""
+    commit = git_head(root)
+    entry = (read_json_cached(PROJECT_CACHE_FILE) or {}).get(commit) if commit else None
+    if not entry:
+        return None
+    framework, relative, build_dir_name = entry
+    return framework, os.path.normpath(os.path.join(root, relative)), build_dir_name
 
-def find_react_vite_project_path(root):
-    """Recursively search for the first folder containing a React + Vite project."""
-    for dirpath, _, filenames in os.walk(root):
-        vite_config_files = ['vite.config.js', 'vite.config.ts', 'vite.config.mjs', 'vite.config.cjs']
-        has_vite_config = any(config in filenames for config in vite_config_files)
-        
-        if has_vite_config and 'package.json' in filenames:
-            try:
-                with open(os.path.join(dirpath, 'package.json')) as f:
-                    package_data = json.load(f)
-                    deps = package_data.get("dependencies", {})
-                    dev_deps = package_data.get("devDependencies", {})
-                    
-                    has_react = "react" in deps or "react" in dev_deps
-                    has_vite = "vite" in dev_deps or "@vitejs/plugin-react" in dev_deps
-                    
-                    if has_react and has_vite:
-                        return dirpath
-                        
-            except Exception:
-                continue
-    return None
-
+def cache_project(root, result):
+    commit = git_head(root)
+    if not commit:
+        return
+    framework, project_path, build_dir_name = result
+    try:
+        entries = dict(read_json_cached(PROJECT_CACHE_FILE) or {})
+        entries.pop(commit, None)
+        entries[commit] = [framework, os.path.relpath(project_path, root), build_dir_name]
+        PROJECT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        write_json(PROJECT_CACHE_FILE, dict(list(entries.items())[-PROJECT_CACHE_SIZE:]))
+    except (OSError, ValueError) as e:
+        click.echo(f"⚠️ Warning: Could not cache project detection: {e}")
 
+def find_project_path(root):
+    return detect_project(root)[1]
 
 # ----------------------
 # 📥 Git Cloner
@@ -156,53 +277,201 @@ def handle_remove_readonly(func, path, exc_info):
     os.chmod(path, stat.S_IWRITE)
     func(path)
 
-def clone_repository(repo_url, tmp_dir):
-    """Clones a Git repo to a temporary directory and removes .git folder."""
+def rmtree_readonly(path):
+    if os.name != 'nt':
+        # Deleting only needs write access to the parent directory here
+        shutil.rmtree(path)
+        return
+    # git marks its objects read-only; clearing them in one pass up front saves a
+    # failed delete plus a retry per file
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                os.chmod(os.path.join(dirpath, name), stat.S_IWRITE)
+            except OSError:
+                pass
+    # onerror is deprecated from 3.12 on; the handler works with either hook
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=handle_remove_readonly)
+    else:
+        shutil.rmtree(path, onerror=handle_remove_readonly)
+
+# Unlinking is syscall-bound and mostly waits on the disk, so more threads than cores help
+REMOVE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def remove_tree(path):
+    """
+    Best-effort delete of a work directory. Files are unlinked one directory
+    per task in parallel, then the emptied directories are removed deepest first.
+    """
+    directories = []
+    batches = []
+    pending = [path]
+    while pending:
+        dirpath = pending.pop()
+        directories.append(dirpath)
+        files = []
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    else:
+                        files.append(entry.path)
+        except OSError:
+            continue
+        if files:
+            batches.append(files)
+
+    def unlink_all(files):
+        for file_path in files:
+            try:
+                try:
+                    os.remove(file_path)
+                except PermissionError:
+                    handle_remove_readonly(os.remove, file_path, None)
+            except OSError:
+                pass
+
+    with ThreadPoolExecutor(max_workers=REMOVE_WORKERS) as executor:
+        list(executor.map(unlink_all, batches))
+    # Parents are listed before their children, so reversed order is deepest first
+    for dirpath in reversed(directories):
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass
+
+MANIFEST_PATTERNS = ['package.json', 'angular.json', 'vite.config.*']
+# Submodules are fetched in parallel
+GIT_JOBS = '8'
+
+def get_workspace(repo_url):
+    key = hashlib.sha1(repo_url.encode()).hexdigest()[:12]
+    return str(REPO_CACHE_DIR / key)
+
+def git_head(workspace):
+    result = subprocess.run(
+        ['git', 'rev-parse', 'HEAD'],
+        cwd=workspace, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def is_sparse(workspace):
+    result = subprocess.run(
+        ['git', 'config', '--get', 'core.sparseCheckout'],
+        cwd=workspace, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    return result.stdout.strip() == 'true'
+
+def narrow_checkout(workspace, find_project=None):
+    """
+    Check out only the subtree find_project locates. Manifests are
+    materialised first so the finder can run; the project directory is
+    then the only part of a monorepo whose blobs are fetched. Without a
+    finder only the manifests are checked out, which is all init needs.
+    Root-level files stay checked out alongside the project subtree.
+    A project already located at this commit skips the manifest pass.
+    """
+    cached = get_cached_project(workspace) if find_project else None
+    if cached:
+        project_path = cached[1]
+    else:
+        subprocess.run(['git', 'sparse-checkout', 'set', '--no-cone', *MANIFEST_PATTERNS], cwd=workspace, check=True)
+        subprocess.run(['git', 'checkout'], cwd=workspace, check=True)
+        if not find_project:
+            return
+        project_path = find_project(workspace)
+
+    relative = os.path.relpath(project_path, workspace) if project_path else os.curdir
+    if relative == os.curdir:
+        subprocess.run(['git', 'sparse-checkout', 'disable'], cwd=workspace, check=True)
+    else:
+        # Cone mode also keeps the files at the root and in each parent directory:
+        # a workspace root package.json, its lockfile, tsconfig.base.json, .gitmodules
+        subtree = relative.replace(os.sep, "/")
+        subprocess.run(['git', 'sparse-checkout', 'set', '--cone', subtree], cwd=workspace, check=True)
+    if cached:
+        # Nothing was checked out yet on a fresh --no-checkout clone
+        subprocess.run(['git', 'checkout'], cwd=workspace, check=True)
+
+def sparse_clone(repo_url, workspace, find_project=None):
+    """Partial clone that only checks out the project's subtree (or just the manifests)."""
+    subprocess.run(
+        ['git', 'clone', '--depth', '1', '--filter=blob:none', '--no-checkout', repo_url, workspace],
+        check=True
+    )
+    narrow_checkout(workspace, find_project)
+
+def update_submodules(workspace):
+    if not os.path.exists(os.path.join(workspace, '.gitmodules')):
+        return
+    subprocess.run(
+        ['git', 'submodule', 'update', '--init', '--recursive', '--depth', '1', '--jobs', GIT_JOBS],
+        cwd=workspace, check=True
+    )
+
+def update_clone(workspace, commit=None):
+    """Move a cached clone to the remote HEAD, keeping node_modules for the next install."""
+    if not commit or git_head(workspace) != commit:
+        subprocess.run(['git', 'fetch', '--depth', '1', 'origin', 'HEAD'], cwd=workspace, check=True)
+        subprocess.run(['git', 'reset', '--hard', 'FETCH_HEAD'], cwd=workspace, check=True)
+    # Drop build output and generated files from the previous run
+    subprocess.run(['git', 'clean', '-fdxq', '-e', 'node_modules'], cwd=workspace, check=True)
+
+def clone_repository(repo_url, workspace, find_project=None, commit=None, manifests_only=False):
+    """
+    Clones a Git repo into workspace, or updates the clone a previous run left there.
+    With manifests_only, a fresh clone only checks out package.json and friends.
+    """
     try:
-        subprocess.run(['git', 'clone', '--depth', '1', repo_url, tmp_dir], check=True)
-        
-        # Force remove .git even if files are readonly (Windows)
-        git_dir = os.path.join(tmp_dir, '.git')
-        if os.path.exists(git_dir):
-            shutil.rmtree(git_dir, onerror=handle_remove_readonly)
-        
+        if os.path.isdir(os.path.join(workspace, '.git')):
+            try:
+                update_clone(workspace, commit)
+                if is_sparse(workspace):
+                    if manifests_only:
+                        narrow_checkout(workspace)
+                    elif find_project:
+                        narrow_checkout(workspace, find_project)
+                    else:
+                        subprocess.run(['git', 'sparse-checkout', 'disable'], cwd=workspace, check=True)
+                if not manifests_only:
+                    update_submodules(workspace)
+                return True
+            except subprocess.CalledProcessError:
+                # Broken cache (e.g. an interrupted clone): start over
+                rmtree_readonly(workspace)
+
+        REPO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cloned = False
+        if find_project or manifests_only:
+            try:
+                sparse_clone(repo_url, workspace, find_project)
+                cloned = True
+            except subprocess.CalledProcessError:
+                # Older git without partial clone / sparse-checkout: fall back to a full clone
+                rmtree_readonly(workspace)
+        if not cloned:
+            subprocess.run(
+                ['git', 'clone', '--depth', '1', '--recurse-submodules', '--shallow-submodules',
+                 '--jobs', GIT_JOBS, repo_url, workspace],
+                check=True
+            )
+        elif not manifests_only:
+            update_submodules(workspace)
         return True
     except subprocess.CalledProcessError:
+        remove_tree(workspace)
         return False
 
-def detect_framework(project_path):
-    for dirpath, _, filenames in os.walk(project_path):
-        if 'package.json' in filenames:
-            try:
-                with open(os.path.join(dirpath, 'package.json')) as f:
-                    pkg = json.load(f)
-                deps = pkg.get("dependencies", {})
-                dev_deps = pkg.get("devDependencies", {})
-                all_deps = {**deps, **dev_deps}
-
-                if "next" in all_deps:
-                    return "nextjs"
-                if "@angular/core" in all_deps:
-                    return "angular"
-
-                if ("react" in all_deps and 
-                    ("vite" in all_deps or "@vitejs/plugin-react" in all_deps)):
-                    return "react-vite"
-
-                if "react" in all_deps:
-                    return "react"
-            except Exception:
-                continue
-    return None
-
-
 # ----------------------
 # 🚀 Deploy Command
 # ----------------------
 
 @cli.command()
-@click.argument('environment')
-def deploy(environment):
+@click.argument('environments', nargs=-1, required=True)
+def deploy(environments):
+    """🚀 Build once and deploy to one or more environments."""
     config = load_config()
     if not config:
         click.echo("Run 'deploy-tool init <repo_url>' first.")
@@ -210,45 +479,353 @@ def deploy(environment):
 
     repo_url = config["repo_url"]
     framework = config["framework"]
-    tmp_dir = tempfile.mkdtemp()
+    environments = list(dict.fromkeys(environments))
+    if framework not in BUCKET_PREFIXES and len(environments) > 1:
+        # The EC2 and ECR state files track a single deployment, so rollback could
+        # only clean up the last one
+        click.echo(f"❌ {framework} apps deploy to one environment at a time "
+                   f"(rollback tracks a single instance). Got: {', '.join(environments)}")
+        return
+    require_tools("git", *REQUIRED_TOOLS.get(framework, []))
+
+    commit = get_remote_head(repo_url)
+    build_key = build_cache_key(repo_url, commit)
+    if framework in BUCKET_PREFIXES:
+        cached_build = get_cached_build(build_key)
+        if cached_build:
+            click.echo(f"Using cached build for commit {commit[:7]}")
+            publish_to_environments(cached_build, environments, bucket_prefix=BUCKET_PREFIXES[framework])
+            return
+
+    workspace = get_workspace(repo_url)
 
     click.echo(f"Cloning repo: {repo_url}")
-    if not clone_repository(repo_url, tmp_dir):
+    if not clone_repository(repo_url, workspace, find_project_path, commit):
         click.echo("Failed to clone repo.")
         return
+    clear_scan_cache()
+
+    framework, project_path, build_dir_name = detect_project(workspace)
+    if not project_path:
+        click.echo("No supported project found in the repo.")
+        return
+    build_dir = os.path.join(project_path, build_dir_name) if build_dir_name else None
 
     if framework == "react":
-        deploy_react(tmp_dir, environment)
+        deploy_react(project_path, build_dir, environments, build_key)
     elif framework == "react-vite":
-        deploy_react_vite(tmp_dir, environment)
+        deploy_react_vite(project_path, build_dir, environments, build_key)
     elif framework == "angular":
-        deploy_angular(tmp_dir, environment)
+        deploy_angular(project_path, build_dir, environments, build_key)
     elif framework == "nextjs":
-        deploy_dockerized(tmp_dir, framework, environment)
+        deploy_dockerized(project_path, framework, environments[0])
     else:
         click.echo(" Unsupported framework.")
 
-    shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
+# ----------------------
+# 🗃️ Build Cache
+# ----------------------
+
+def get_remote_head(repo_url):
+    """Return the commit SHA of the remote HEAD without cloning, or None."""
+    result = subprocess.run(
+        ['git', 'ls-remote', repo_url, 'HEAD'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.split()[0]
+
+def build_cache_key(repo_url, commit):
+    """
+    Builds are cached per repo and commit. The commit pins package-lock.json
+    too, so the lockfile needs no separate key.
+    """
+    if not commit:
+        return None
+    return f"{hashlib.sha1(repo_url.encode()).hexdigest()[:12]}-{commit}"
+
+def get_cached_build(key):
+    if not key:
+        return None
+    cached = BUILD_CACHE_DIR / key
+    if not cached.is_dir():
+        return None
+    # Mark as recently used so eviction keeps it
+    os.utime(cached)
+    return str(cached)
+
+def cache_build(build_dir, key):
+    """Keep a copy of the build output so redeploys of the same commit skip clone and build."""
+    if not key:
+        return
+    target = BUILD_CACHE_DIR / key
+    staging = BUILD_CACHE_DIR / f"{key}.tmp"
+    try:
+        shutil.rmtree(staging, ignore_errors=True)
+        shutil.copytree(build_dir, staging)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+        # copytree copies the build folder's mtime; eviction needs the time it was cached
+        os.utime(target)
+    except OSError as e:
+        shutil.rmtree(staging, ignore_errors=True)
+        click.echo(f"⚠️ Warning: Could not cache build: {e}")
+        return
+    evict_cached_builds()
 
-def deploy_dockerized(tmp_dir, framework, environment):
-    write_dockerfile(framework, tmp_dir)
+def evict_cached_builds():
+    """Drop the least recently used builds beyond BUILD_CACHE_SIZE."""
+    try:
+        entries = [entry for entry in os.scandir(BUILD_CACHE_DIR)
+                   if entry.is_dir() and not entry.name.endswith('.tmp')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in entries[BUILD_CACHE_SIZE:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+# Written into node_modules after an install; the cached clone keeps node_modules between runs
+NPM_INSTALL_STAMP = '.deploy_tool_lock.sha1'
+
+def npm_install_command(project_path):
+    """npm ci is faster and reproducible, but needs a lockfile."""
+    # Audit/fund lookups are extra registry round trips we never use; --prefer-offline
+    # takes anything already in npm's cache without revalidating it against the registry
+    flags = ['--prefer-offline', '--no-audit', '--no-fund', '--no-progress', '--loglevel=error']
+    if os.path.exists(os.path.join(project_path, 'package-lock.json')):
+        return ['npm', 'ci', *flags]
+    return ['npm', 'install', *flags]
+
+def npm_env(env=None):
+    env = dict(env if env is not None else os.environ)
+    # Skip the registry version check npm runs after every command
+    env.setdefault('npm_config_update_notifier', 'false')
+    return env
+
+# npm 7+ also installs from yarn.lock when there is no package-lock.json
+LOCKFILES = ('package-lock.json', 'yarn.lock')
+
+def lockfile_digest(project_path):
+    for name in LOCKFILES:
+        try:
+            with open(os.path.join(project_path, name), 'rb') as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            continue
+    return None
+
+def install_dependencies(project_path, env=None):
+    """Run npm ci/install, unless node_modules was installed from this exact lockfile."""
+    digest = lockfile_digest(project_path)
+    stamp_path = os.path.join(project_path, 'node_modules', NPM_INSTALL_STAMP)
+    if digest and os.path.exists(stamp_path):
+        with open(stamp_path) as f:
+            if f.read().strip() == digest:
+                click.echo("Dependencies unchanged, skipping npm install.")
+                return
+
+    run_streamed(npm_install_command(project_path), cwd=project_path, env=npm_env(env))
+    if digest:
+        os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+        with open(stamp_path, 'w') as f:
+            f.write(digest)
+
+# Lines that mean the build has already failed, even though the bundler keeps going
+BUILD_ERROR_PATTERN = re.compile(r'(ERR!|ERROR in |Failed to compile|\bTS\d{4}:)')
+# Output after the first error line usually explains it, so keep reading briefly before stopping
+BUILD_ERROR_GRACE = 2
+
+def stop_process_tree(process):
+    """npm runs the bundler as a child that keeps the output pipe open, so stop the whole tree."""
+    if process.poll() is not None:
+        return
+    if os.name == 'nt':
+        subprocess.run(
+            ['taskkill', '/F', '/T', '/PID', str(process.pid)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+def run_streamed(command, cwd, env=None, fail_pattern=None):
+    """
+    Run a build step, echoing its output line by line as it is produced.
+    If a line matches fail_pattern the step is stopped shortly after.
+    """
+    # which() resolves npm/ng to their .cmd shims on Windows, so no shell is needed to find them
+    executable = shutil.which(command[0]) or command[0]
+    process = subprocess.Popen(
+        [executable, *command[1:]],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        encoding='utf-8',
+        errors='replace',
+        # Own process group so the build can be stopped as a unit
+        start_new_session=bool(fail_pattern) and os.name != 'nt'
+    )
+    stopper = None
+    try:
+        for line in process.stdout:
+            click.echo(line, nl=False)
+            if stopper is None and fail_pattern and fail_pattern.search(line):
+                stopper = threading.Timer(BUILD_ERROR_GRACE, stop_process_tree, args=(process,))
+                stopper.start()
+    except KeyboardInterrupt:
+        # The separate process group doesn't see the terminal's Ctrl+C
+        stop_process_tree(process)
+        raise
+    finally:
+        if stopper:
+            stopper.cancel()
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+
+def deploy_dockerized(project_dir, framework, environment):
+    from botocore.exceptions import ClientError
+    from .aws import provision_ec2_with_docker, push_image_to_ecr, run_image_on_ec2, upload_and_run_on_ec2
+
+    write_dockerfile(framework, project_dir)
+
+    # With a local Docker engine, build and push to ECR while the instance boots
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        image_build = None
+        if shutil.which("docker"):
+            click.echo(" Building image locally for ECR...")
+            image_build = executor.submit(push_image_to_ecr, project_dir, environment)
+
+        click.echo(" Launching EC2...")
+        instance_ip = provision_ec2_with_docker(environment)
+
+        image = None
+        if image_build:
+            try:
+                image = image_build.result()
+            except (RuntimeError, ClientError) as e:
+                click.echo(f"⚠️ Local image build failed ({e}), building on EC2 instead.")
 
-    click.echo(" Launching EC2...")
-    instance_ip = provision_ec2_with_docker(environment)
     if not instance_ip:
         click.echo("❌EC2 setup failed.")
         return
 
+    if image:
+        click.echo(" Pulling and running image on EC2...")
+        run_image_on_ec2(instance_ip, *image)
+        click.echo(f" Deployed at: http://{instance_ip}")
+        return
+
     click.echo(" Packaging app...")
-    archive_path = shutil.make_archive('app', 'zip', tmp_dir)
+    archive_path = make_app_archive(project_dir)
 
     click.echo(" Uploading and running app on EC2...")
     upload_and_run_on_ec2(instance_ip, archive_path, framework)
 
     click.echo(f" Deployed at: http://{instance_ip}")
 
+# The cached clone keeps its git history and may hold a local node_modules or build;
+# the image installs and builds from scratch anyway
+ARCHIVE_EXCLUDES = {'.git', 'node_modules', '.next', 'dist', 'coverage'}
+ARCHIVE_EXCLUDE_SUFFIXES = ('.log',)
+# Stray logs alone aren't worth a line of output
+ARCHIVE_SKIP_REPORT_BYTES = 100 * 1024
+
+# Written into the checkout by write_dockerfile, so not part of the commit
+GENERATED_FILES = ['Dockerfile', '.dockerignore']
+# Fastest gzip level: source text still shrinks several-fold for a fraction of the CPU
+ARCHIVE_COMPRESSLEVEL = 1
+
+def git_archive(project_dir, archive_path):
+    """
+    Tar the committed project tree straight from git's object store. Returns
+    False when that can't represent the checkout (submodules, no git).
+    """
+    location = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel', '--show-prefix'],
+        cwd=project_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if location.returncode != 0:
+        return False
+    toplevel, _, prefix = location.stdout.partition("\n")
+    # git archive leaves submodule contents out
+    submodules = subprocess.run(
+        ['git', 'submodule', 'status', '--', '.'],
+        cwd=project_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if submodules.returncode != 0 or submodules.stdout.strip():
+        return False
+
+    result = subprocess.run(
+        ['git', 'archive', '--format=tar', '-o', archive_path, f"HEAD:{prefix.strip()}"],
+        cwd=toplevel.strip(), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    return result.returncode == 0
+
+def is_archive_excluded(name):
+    """True for paths inside an excluded directory and for excluded file types."""
+    return (not ARCHIVE_EXCLUDES.isdisjoint(name.split('/'))
+            or name.endswith(ARCHIVE_EXCLUDE_SUFFIXES))
+
+def tree_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def make_app_archive(project_dir):
+    """Pack the app into a gzipped tar for upload."""
+    archive_path = os.path.abspath('app.tar.gz')
+    tar_path = os.path.abspath('app.tar')
+    skipped = 0
+
+    def exclude(tarinfo):
+        nonlocal skipped
+        # Submodules carry a .git file rather than a directory
+        name = os.path.basename(tarinfo.name)
+        if name in ARCHIVE_EXCLUDES or name.endswith(ARCHIVE_EXCLUDE_SUFFIXES):
+            # tar.add doesn't descend into a filtered directory, so size it here
+            skipped += tree_size(os.path.join(project_dir, tarinfo.name)) if tarinfo.isdir() else tarinfo.size
+            return None
+        tarinfo.uid = tarinfo.gid = 0
+        tarinfo.uname = tarinfo.gname = "root"
+        return tarinfo
+
+    if git_archive(project_dir, tar_path):
+        # Compressing has to rewrite the tar anyway, so committed build output, logs
+        # and stale copies of the generated files are dropped on the way through
+        with tarfile.open(tar_path, 'r|') as src, \
+                tarfile.open(archive_path, 'w:gz', compresslevel=ARCHIVE_COMPRESSLEVEL) as dst:
+            for member in src:
+                if member.name in GENERATED_FILES:
+                    continue
+                if is_archive_excluded(member.name):
+                    skipped += member.size
+                    continue
+                dst.addfile(member, src.extractfile(member) if member.isfile() else None)
+            for name in GENERATED_FILES:
+                path = os.path.join(project_dir, name)
+                if os.path.exists(path):
+                    dst.add(path, arcname=name, filter=exclude)
+        os.remove(tar_path)
+    else:
+        with tarfile.open(archive_path, 'w:gz', compresslevel=ARCHIVE_COMPRESSLEVEL) as tar:
+            tar.add(project_dir, arcname='.', filter=exclude)
+
+    if skipped >= ARCHIVE_SKIP_REPORT_BYTES:
+        click.echo(f" Left {skipped / (1024 * 1024):.1f} MB of build output, dependencies and logs out of the archive.")
+    return archive_path
+
 def write_dockerfile(framework, path):
     dockerfile_path = os.path.join(path, 'Dockerfile')
     if framework == 'nextjs':
@@ -265,227 +842,209 @@ CMD ["npm", "run", "start"]
     
     with open(dockerfile_path, 'w') as f:
         f.write(content)
-
-def bucket_exists(bucket_name):
-    s3 = boto3.client("s3")
+    with open(os.path.join(path, '.dockerignore'), 'w') as f:
+        patterns = sorted(ARCHIVE_EXCLUDES) + [f"**/*{suffix}" for suffix in ARCHIVE_EXCLUDE_SUFFIXES]
+        f.write("\n".join(patterns) + "\n")
+
+# Bucket metadata doesn't change during a command, so each bucket is looked up once
+@functools.lru_cache(maxsize=64)
+def describe_bucket(bucket_name):
+    """Return (exists, region) from a single head_bucket call."""
+    from botocore.exceptions import ClientError
+    from .aws import get_s3_client
+    s3 = get_s3_client()
     try:
-        s3.head_bucket(Bucket=bucket_name)
-        return True
-    except ClientError:
-        return False
+        response = s3.head_bucket(Bucket=bucket_name)
+    except ClientError as e:
+        # A bucket in another region answers with a redirect that still names its region
+        headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+        if e.response.get("Error", {}).get("Code") == "301" and "x-amz-bucket-region" in headers:
+            return True, headers["x-amz-bucket-region"]
+        return False, None
+    headers = response["ResponseMetadata"].get("HTTPHeaders", {})
+    return True, headers.get("x-amz-bucket-region")
+
+def find_bucket(environment):
+    """Look up the environment's existing bucket. Returns (bucket, region, website_enabled) or None."""
+    state = get_env_bucket_config(load_bucket_config(), environment)
+    if not state:
+        return None
 
-def get_bucket_region(bucket_name):
-    s3 = boto3.client("s3")
-    try:
-        response = s3.get_bucket_location(Bucket=bucket_name)
-        loc = response.get("LocationConstraint")
-        return "us-east-1" if loc is None else loc
-    except ClientError:
+    candidate = state.get("bucket")
+    exists, bucket_region = describe_bucket(candidate)
+    if not exists:
+        click.echo(f"Config refers to a deleted/missing bucket: {candidate}. Recreating...")
+        return None
+    click.echo(f"Reusing bucket: {candidate} (env={environment})")
+    return candidate, bucket_region or REGION, state.get("website_enabled", False)
+
+def create_bucket(environment, bucket_prefix):
+    """Create the environment's bucket. Returns (bucket, region, website_enabled) or None."""
+    from .aws import create_public_s3_bucket
+    click.echo(f"Creating new bucket for env: {environment}")
+    bucket = create_public_s3_bucket(prefix=f"{environment}-{bucket_prefix}", region=REGION)
+    if not bucket:
+        click.echo("Failed to create bucket.")
         return None
+    # create_public_s3_bucket configures website hosting alongside the bucket policy
+    save_bucket_config(bucket, region=REGION, environment=environment, website_enabled=True)
+    return bucket, REGION, True
 
-def deploy_react(project_root, environment):
+def resolve_bucket(environment, bucket_prefix):
+    """Find the environment's bucket, creating it if needed. Returns (bucket, region, website_enabled)."""
+    return find_bucket(environment) or create_bucket(environment, bucket_prefix)
 
-    react_path = find_react_project_path(project_root)
-    if not react_path:
-        click.echo("No React project found in the repo.")
-        return
+def find_buckets_in_background(environments):
+    """
+    Start looking up each environment's bucket so it overlaps with the build.
+    Missing buckets are only created once the build has succeeded, so a failed
+    build leaves no new public buckets behind.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(environments))
+    lookups = {
+        environment: executor.submit(find_bucket, environment)
+        for environment in environments
+    }
+    # Let the lookups finish on their own; the futures stay usable
+    executor.shutdown(wait=False)
+    return lookups
 
-    click.echo(f"Building React app at: {react_path}")
-    is_windows = platform.system() == "Windows"
-    shell_flag = True if is_windows else False
+def publish_static_site(build_dir, environment, bucket_prefix, pending_lookup=None):
+    """
+    Upload a static build to the environment's bucket and return the site URL.
+    pending_lookup is a future from find_buckets_in_background, if one was started.
+    """
+    from .aws import enable_static_website, get_website_url, upload_to_s3
+    if pending_lookup is not None:
+        target = pending_lookup.result() or create_bucket(environment, bucket_prefix)
+    else:
+        target = resolve_bucket(environment, bucket_prefix)
+    if not target:
+        return None
+    bucket, region, website_enabled = target
+
+    click.echo("Uploading build to S3...")
     try:
-        subprocess.run(['npm', 'install'], cwd=react_path, check=True, shell=shell_flag)
-        subprocess.run(['npm', 'run', 'build'], cwd=react_path, check=True, shell=shell_flag)
-    except subprocess.CalledProcessError:
-        click.echo("Build failed. Ensure it's a valid React project.")
-        return
+        upload_to_s3(build_dir, bucket)
+    except RuntimeError as e:
+        click.echo(f"{e} Ensure AWS credentials are configured.")
+        return None
 
-    build_dir = os.path.join(react_path, 'build')
-    if not os.path.exists(build_dir):
-        click.echo("Build folder not found.")
+    # Website hosting only needs configuring once per bucket
+    if not website_enabled:
+        enable_static_website(bucket)
+        save_bucket_config(bucket, region=region, environment=environment, website_enabled=True)
+
+    return get_website_url(bucket, region)
+
+def publish_to_environments(build_dir, environments, bucket_prefix, lookups=None):
+    """Publish one build to every environment, uploading to the buckets in parallel."""
+    lookups = lookups or {}
+    if len(environments) == 1:
+        environment = environments[0]
+        public_url = publish_static_site(build_dir, environment, bucket_prefix, lookups.get(environment))
+        if public_url:
+            click.echo(f" Site deployed: {public_url}")
         return
 
-    state = load_bucket_config()
-    bucket = None
-    region = "ap-south-1"
+    with ThreadPoolExecutor(max_workers=len(environments)) as executor:
+        futures = {
+            executor.submit(
+                publish_static_site, build_dir, environment, bucket_prefix, lookups.get(environment)
+            ): environment
+            for environment in environments
+        }
+        for future in as_completed(futures):
+            environment = futures[future]
+            try:
+                public_url = future.result()
+            except Exception as e:
+                click.echo(f" [{environment}] Deployment failed: {e}")
+                continue
+            if public_url:
+                click.echo(f" [{environment}] Site deployed: {public_url}")
 
-    if state and state.get("env") == environment:
-        candidate = state.get("bucket")
-        if bucket_exists(candidate):
-            bucket = candidate
-            region = get_bucket_region(candidate) or region
-            click.echo(f"Reusing bucket: {bucket} (env={environment})")
-        else:
-            click.echo(f"Config refers to a deleted/missing bucket: {candidate}. Recreating...")
-    
-    if not bucket:
-        click.echo(f"Creating new bucket for env: {environment}")
-        bucket = create_public_s3_bucket(prefix=f"{environment}-site", region=region)
-        if not bucket:
-            click.echo(" Failed to create bucket.")
-            return
-        save_bucket_config(bucket, region=region, environment=environment)
+def deploy_react(react_path, build_dir, environments, build_key=None):
 
-    click.echo("Uploading via AWS CLI using s3 sync...")
+    click.echo(f"Building React app at: {react_path}")
+    lookups = find_buckets_in_background(environments)
     try:
-        subprocess.run(
-            [
-                "aws", "s3", "sync", build_dir, f"s3://{bucket}", "--delete"
-            ],
-            check=True
-        )
+        install_dependencies(react_path)
+        run_streamed(['npm', 'run', 'build'], cwd=react_path, fail_pattern=BUILD_ERROR_PATTERN)
     except subprocess.CalledProcessError:
-        click.echo("AWS CLI sync failed. Ensure AWS CLI is installed and configured.")
+        click.echo("Build failed. Ensure it's a valid React project.")
         return
 
-    enable_static_website(bucket)
+    if not os.path.exists(build_dir):
+        click.echo("Build folder not found.")
+        return
 
-    public_url = get_website_url(bucket, region)
-    click.echo(f" Site deployed: {public_url}")
+    cache_build(build_dir, build_key)
+    publish_to_environments(build_dir, environments, BUCKET_PREFIXES["react"], lookups)
 
-def deploy_angular(project_root, environment):
-
-    angular_path = find_angular_project_path(project_root)
-    if not angular_path:
-        click.echo("No Angular project found in the repo.")
-        return
+def deploy_angular(angular_path, base_build_dir, environments, build_key=None):
 
     click.echo(f"Building Angular app at: {angular_path}")
-    is_windows = platform.system() == "Windows"
-    shell_flag = True if is_windows else False
+    lookups = find_buckets_in_background(environments)
 
     build_env = os.environ.copy()
     build_env["NODE_OPTIONS"] = "--openssl-legacy-provider"
 
     try:
-        subprocess.run(['npm', 'install'], cwd=angular_path, check=True, shell=shell_flag, env=build_env)
-        subprocess.run(
+        install_dependencies(angular_path, env=build_env)
+        run_streamed(
             ['ng', 'build', '--configuration=production'],
-            cwd=angular_path, check=True, shell=shell_flag, env=build_env
+            cwd=angular_path, env=build_env, fail_pattern=BUILD_ERROR_PATTERN
         )
     except subprocess.CalledProcessError:
         click.echo(" Build failed. Ensure it's a valid Angular project and Node options are supported.")
         return
 
-    base_build_dir = os.path.join(angular_path, 'dist')
-    if not os.path.exists(base_build_dir):
-        click.echo("Build folder not found.")
-        return
-
     def find_index_html_directory(base_path):
-        """Recursively find the directory containing index.html."""
-        for root, dirs, files in os.walk(base_path):
+        """
+        Find the directory containing index.html, trying Angular's usual output
+        layouts first. A missing build folder simply yields None.
+        """
+        # dist/index.html, dist/<project>/browser/index.html (17+), dist/<project>/index.html
+        for pattern in ('index.html', '*/browser/index.html', '*/index.html'):
+            for index_html in Path(base_path).glob(pattern):
+                return str(index_html.parent)
+        for root, files in walk_pruned(base_path):
             if 'index.html' in files:
                 return root
         return None
 
     build_dir = find_index_html_directory(base_build_dir)
     if not build_dir:
-        click.echo("Could not find index.html in build output.")
+        click.echo(f"Could not find index.html in build output ({base_build_dir}).")
         return
 
-    state = load_bucket_config()
-    bucket = None
-    region = "ap-south-1"
+    cache_build(build_dir, build_key)
+    publish_to_environments(build_dir, environments, BUCKET_PREFIXES["angular"], lookups)
 
-    if state and state.get("env") == environment:
-        candidate = state.get("bucket")
-        if bucket_exists(candidate):
-            bucket = candidate
-            region = get_bucket_region(candidate) or region
-            click.echo(f"Reusing bucket: {bucket} (env={environment})")
-        else:
-            click.echo(f"Config refers to a deleted/missing bucket: {candidate}. Recreating...")
 
-    if not bucket:
-        click.echo(f"Creating new bucket for env: {environment}")
-        bucket = create_public_s3_bucket(prefix=f"{environment}-angular-site", region=region)
-        if not bucket:
-            click.echo("Failed to create bucket.")
-            return
-        save_bucket_config(bucket, region=region, environment=environment)
 
-    click.echo("Uploading via AWS CLI using s3 sync...")
-    try:
-        subprocess.run(
-            ["aws", "s3", "sync", build_dir, f"s3://{bucket}", "--delete"],
-            check=True
-        )
-    except subprocess.CalledProcessError:
-        click.echo("AWS CLI sync failed. Ensure AWS CLI is installed and configured.")
-        return
-
-    enable_static_website(bucket)
-
-    public_url = get_website_url(bucket, region)
-    click.echo(f" Site deployed: {public_url}")
-
-
-
-def deploy_react_vite(project_root, environment):
-
-    react_vite_path = find_react_vite_project_path(project_root)
-    if not react_vite_path:
-        click.echo("No React + Vite project found in the repo.")
-        return
+def deploy_react_vite(react_vite_path, build_dir, environments, build_key=None):
 
     click.echo(f" Building React + Vite app at: {react_vite_path}")
-    is_windows = platform.system() == "Windows"
-    shell_flag = True if is_windows else False
+    lookups = find_buckets_in_background(environments)
     try:
-        subprocess.run(['npm', 'install'], cwd=react_vite_path, check=True, shell=shell_flag)
-        subprocess.run(
+        install_dependencies(react_vite_path)
+        run_streamed(
             ['npm', 'run', 'build'],
-            cwd=react_vite_path, check=True, shell=shell_flag
+            cwd=react_vite_path, fail_pattern=BUILD_ERROR_PATTERN
         )
     except subprocess.CalledProcessError:
         click.echo(" Build failed. Ensure it's a valid React + Vite project.")
         return
 
-    build_dir = os.path.join(react_vite_path, 'dist')
-    if not os.path.exists(build_dir):
-        click.echo(" Build folder not found.")
-        return
-
-    if not os.path.exists(os.path.join(build_dir, 'index.html')):
-        click.echo(" index.html not found in build output.")
-        return
-
-    state = load_bucket_config()
-    bucket = None
-    region = "ap-south-1"
-
-    if state and state.get("env") == environment:
-        candidate = state.get("bucket")
-        if bucket_exists(candidate):
-            bucket = candidate
-            region = get_bucket_region(candidate) or region
-            click.echo(f" Reusing bucket: {bucket} (env={environment})")
-        else:
-            click.echo(f"Config refers to a deleted/missing bucket: {candidate}. Recreating...")
-
-    if not bucket:
-        click.echo(f"Creating new bucket for env: {environment}")
-        bucket = create_public_s3_bucket(prefix=f"{environment}-react-vite-site", region=region)
-        if not bucket:
-            click.echo("Failed to create bucket.")
-            return
-        save_bucket_config(bucket, region=region, environment=environment)
-
-    click.echo(" Uploading via AWS CLI using s3 sync...")
-    try:
-        subprocess.run(
-            ["aws", "s3", "sync", build_dir, f"s3://{bucket}", "--delete"],
-            check=True
-        )
-    except subprocess.CalledProcessError:
-        click.echo("AWS CLI sync failed. Ensure AWS CLI is installed and configured.")
+    # One stat covers both the build folder and its index.html
+    if not os.path.isfile(os.path.join(build_dir, 'index.html')):
+        click.echo(f" index.html not found in build output ({build_dir}).")
         return
 
-    enable_static_website(bucket)
-
-    public_url = get_website_url(bucket, region)
-    click.echo(f"Site deployed: {public_url}")
+    cache_build(build_dir, build_key)
+    publish_to_environments(build_dir, environments, BUCKET_PREFIXES["react-vite"], lookups)
 
 
 @cli.group()
@@ -497,24 +1056,108 @@ def status():
     click.echo(f"have to implement this logic in future, sorry")
 
 
-@monitor.command()
-def init():
+# Each stack is a full EC2 instance; larger batches are more likely a typo than a plan
+MAX_MONITOR_STACKS = 10
+
+@monitor.command("init")
+@click.option('--count', default=1, show_default=True, type=click.IntRange(1, MAX_MONITOR_STACKS),
+              help='Number of monitoring stacks to launch in one call')
+def monitor_init(count):
 
     default_instance_type = "t3.small"
     click.echo(f"Setting up monitoring stack on EC2 ({default_instance_type})...")
     from deploy_tool.monitor.ec2_monitor import provision_monitoring_instance
-    provision_monitoring_instance(default_instance_type)
+    provision_monitoring_instance(default_instance_type, count=count)
+
+# Shared by every panel; json serializes these without copying them per panel
+PERCENT_THRESHOLDS = {
+    "mode": "absolute",
+    "steps": [
+        {"color": "green", "value": None},
+        {"color": "orange", "value": 70},
+        {"color": "red", "value": 90}
+    ]
+}
+BYTES_RATE_THRESHOLDS = {
+    "mode": "absolute",
+    "steps": [
+        {"color": "green", "value": None},
+        {"color": "orange", "value": 1000000},
+        {"color": "red", "value": 10000000}
+    ]
+}
+PANEL_OPTIONS = {
+    "legend": {
+        "displayMode": "table",
+        "placement": "bottom"
+    },
+    "tooltip": {
+        "mode": "single"
+    }
+}
+DISK_FILTER = 'mountpoint!="/boot",fstype!~"tmpfs|overlay"'
+PANEL_HEIGHT = 8
+
+# (title, unit, thresholds, targets), stacked top to bottom
+DASHBOARD_PANELS = [
+    ("CPU Usage (%)", "percent", PERCENT_THRESHOLDS, [
+        {
+            "expr": "100 - (avg by(instance) (rate(node_cpu_seconds_total{mode=\"idle\"}[5m])) * 100)",
+            "legendFormat": "{{instance}}",
+            "refId": "A"
+        }
+    ]),
+    ("Memory Usage (%)", "percent", PERCENT_THRESHOLDS, [
+        {
+            "expr": "(1 - (node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes)) * 100",
+            "legendFormat": "{{instance}}",
+            "refId": "B"
+        }
+    ]),
+    ("Disk Usage (%)", "percent", PERCENT_THRESHOLDS, [
+        {
+            "expr": f"(node_filesystem_size_bytes{{{DISK_FILTER}}} - node_filesystem_free_bytes{{{DISK_FILTER}}}) / node_filesystem_size_bytes{{{DISK_FILTER}}} * 100",
+            "legendFormat": "{{instance}} {{mountpoint}}",
+            "refId": "C"
+        }
+    ]),
+    ("Network Traffic (Bytes/sec)", "Bps", BYTES_RATE_THRESHOLDS, [
+        {
+            "expr": "rate(node_network_receive_bytes_total[5m])",
+            "legendFormat": "{{instance}} RX",
+            "refId": "D"
+        },
+        {
+            "expr": "rate(node_network_transmit_bytes_total[5m])",
+            "legendFormat": "{{instance}} TX",
+            "refId": "E"
+        }
+    ]),
+]
 
-from deploy_tool.monitor.monitor_config import get_monitor_instance_config
+def dashboard_panel(title, unit, thresholds, targets, datasource, y):
+    """A full-width timeseries panel."""
+    return {
+        "type": "timeseries",
+        "title": title,
+        "datasource": datasource,
+        "targets": targets,
+        "gridPos": {"x": 0, "y": y, "w": 24, "h": PANEL_HEIGHT},
+        "fieldConfig": {
+            "defaults": {
+                "unit": unit,
+                "thresholds": thresholds
+            },
+            "overrides": []
+        },
+        "options": PANEL_OPTIONS
+    }
 
 @monitor.command("dashboard")
 @click.pass_context
 def create_dashboard(ctx):
     """Create and update Grafana dashboard with app link if S3 deployed."""
-    import requests
-    import json
-    import os
-    from pathlib import Path
+    from deploy_tool.monitor.monitor_config import get_monitor_instance_config
     
 
     config = get_monitor_instance_config()
@@ -530,186 +1173,20 @@ def create_dashboard(ctx):
     try:
         bucket_json_path = Path.home() / ".deploy-tool" / "bucket.json"
         if bucket_json_path.exists():
-            with open(bucket_json_path) as f:
-                bucket_config = json.load(f)
-                bucket = bucket_config["bucket"]
-                region = bucket_config["region"]
-                s3_app_url = f"https://{bucket}.s3.{region}.amazonaws.com/index.html"
+            bucket_config = read_json(bucket_json_path)
+            bucket = bucket_config["bucket"]
+            region = bucket_config["region"]
+            s3_app_url = f"https://{bucket}.s3.{region}.amazonaws.com/index.html"
     except Exception as e:
         click.echo(f"⚠️ Warning: Could not read S3 link: {e}")
 
     
     uid = get_prometheus_uid()
-    panels = []
-
-# CPU Usage Panel
-    panels.append({
-        "type": "timeseries",
-        "title": "CPU Usage (%)",
-        "datasource": {
-            "type": "prometheus",
-            "uid": uid
-        },
-        "targets": [
-            {
-                "expr": "100 - (avg by(instance) (rate(node_cpu_seconds_total{mode=\"idle\"}[5m])) * 100)",
-                "legendFormat": "{{instance}}",
-                "refId": "A"
-            }
-        ],
-        "gridPos": {"x": 0, "y": 0, "w": 24, "h": 8},
-        "fieldConfig": {
-            "defaults": {
-                "unit": "percent",
-                "thresholds": {
-                    "mode": "absolute",
-                    "steps": [
-                        {"color": "green", "value": None},
-                        {"color": "orange", "value": 70},
-                        {"color": "red", "value": 90}
-                    ]
-                }
-            },
-            "overrides": []
-        },
-        "options": {
-            "legend": {
-                "displayMode": "table",
-                "placement": "bottom"
-            },
-            "tooltip": {
-                "mode": "single"
-            }
-        }
-    })
-
-    # Memory Usage Panel
-    panels.append({
-        "type": "timeseries",
-        "title": "Memory Usage (%)",
-        "datasource": {
-            "type": "prometheus",
-            "uid": uid
-        },
-        "targets": [
-            {
-                "expr": "(1 - (node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes)) * 100",
-                "legendFormat": "{{instance}}",
-                "refId": "B"
-            }
-        ],
-        "gridPos": {"x": 0, "y": 8, "w": 24, "h": 8},
-        "fieldConfig": {
-            "defaults": {
-                "unit": "percent",
-                "thresholds": {
-                    "mode": "absolute",
-                    "steps": [
-                        {"color": "green", "value": None},
-                        {"color": "orange", "value": 70},
-                        {"color": "red", "value": 90}
-                    ]
-                }
-            },
-            "overrides": []
-        },
-        "options": {
-            "legend": {
-                "displayMode": "table",
-                "placement": "bottom"
-            },
-            "tooltip": {
-                "mode": "single"
-            }
-        }
-    })
-
-    # Disk Usage Panel
-    panels.append({
-        "type": "timeseries",
-        "title": "Disk Usage (%)",
-        "datasource": {
-            "type": "prometheus",
-            "uid": uid
-        },
-        "targets": [
-            {
-                "expr": "(node_filesystem_size_bytes{mountpoint!=\"/boot\",fstype!~\"tmpfs|overlay\"} - node_filesystem_free_bytes{mountpoint!=\"/boot\",fstype!~\"tmpfs|overlay\"}) / node_filesystem_size_bytes{mountpoint!=\"/boot\",fstype!~\"tmpfs|overlay\"} * 100",
-                "legendFormat": "{{instance}} {{mountpoint}}",
-                "refId": "C"
-            }
-        ],
-        "gridPos": {"x": 0, "y": 16, "w": 24, "h": 8},
-        "fieldConfig": {
-            "defaults": {
-                "unit": "percent",
-                "thresholds": {
-                    "mode": "absolute",
-                    "steps": [
-                        {"color": "green", "value": None},
-                        {"color": "orange", "value": 70},
-                        {"color": "red", "value": 90}
-                    ]
-                }
-            },
-            "overrides": []
-        },
-        "options": {
-            "legend": {
-                "displayMode": "table",
-                "placement": "bottom"
-            },
-            "tooltip": {
-                "mode": "single"
-            }
-        }
-    })
-
-    # Network Traffic Panel
-    panels.append({
-        "type": "timeseries",
-        "title": "Network Traffic (Bytes/sec)",
-        "datasource": {
-            "type": "prometheus",
-            "uid": uid
-        },
-        "targets": [
-            {
-                "expr": "rate(node_network_receive_bytes_total[5m])",
-                "legendFormat": "{{instance}} RX",
-                "refId": "D"
-            },
-            {
-                "expr": "rate(node_network_transmit_bytes_total[5m])",
-                "legendFormat": "{{instance}} TX",
-                "refId": "E"
-            }
-        ],
-        "gridPos": {"x": 0, "y": 24, "w": 24, "h": 8},
-        "fieldConfig": {
-            "defaults": {
-                "unit": "Bps",
-                "thresholds": {
-                    "mode": "absolute",
-                    "steps": [
-                        {"color": "green", "value": None},
-                        {"color": "orange", "value": 1000000},
-                        {"color": "red", "value": 10000000}
-                    ]
-                }
-            },
-            "overrides": []
-        },
-        "options": {
-            "legend": {
-                "displayMode": "table",
-                "placement": "bottom"
-            },
-            "tooltip": {
-                "mode": "single"
-            }
-        }
-    })
+    datasource = {"type": "prometheus", "uid": uid}
+    panels = [
+        dashboard_panel(title, unit, thresholds, targets, datasource, y=index * PANEL_HEIGHT)
+        for index, (title, unit, thresholds, targets) in enumerate(DASHBOARD_PANELS)
+    ]
 
     dashboard_payload = {
         "dashboard": {
@@ -728,7 +1205,8 @@ def create_dashboard(ctx):
 
 
     url = f"http://{ip}:3000/api/dashboards/db"
-    response = requests.post(url, headers=headers, json=dashboard_payload, auth=auth)
+    # Serialized up front (orjson when installed) rather than by requests' stdlib json
+    response = grafana_session().post(url, headers=headers, data=dump_json(dashboard_payload), auth=auth, timeout=GRAFANA_TIMEOUT)
 
     if response.status_code == 200:
         click.echo("Grafana dashboard created successfully!")
@@ -739,75 +1217,92 @@ def create_dashboard(ctx):
 
 
 def get_stored_grafana_url():
-    metadata_file = os.path.expanduser("~/.deploy_tool/monitor.json")
-    if not os.path.exists(metadata_file):
+    from deploy_tool.monitor.monitor_config import get_monitor_instance_config
+    try:
+        data = get_monitor_instance_config()
+    except FileNotFoundError:
         raise Exception("No monitoring metadata found. Did you run `deploy-tool monitor init`?")
-    
-    with open(metadata_file) as f:
-        data = json.load(f)
-        return data.get("grafana_url")
+    return data.get("grafana_url") or f"http://{data['public_ip']}:{data.get('grafana_port', 3000)}"
+
+GRAFANA_TIMEOUT = 10
+
+@functools.lru_cache(maxsize=1)
+def grafana_session():
+    """
+    One keep-alive session for all Grafana API calls. Refused connections and
+    gateway errors while Grafana is still starting are retried: once right
+    away, then after 2, 4, 8, 16 and 32s.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
+    retry = Retry(total=6, backoff_factor=1, status_forcelist=[502, 503, 504])
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+    return session
+
+# The datasource uid doesn't change during a command, so Grafana is asked once
+@functools.lru_cache(maxsize=1)
 def get_prometheus_uid():
+    import requests
+    from deploy_tool.monitor.monitor_config import get_monitor_instance_config
     config = get_monitor_instance_config()
     ip = config["public_ip"]
     
     headers = {"Content-Type": "application/json"}
     auth = ("admin", "admin")
-    
-    # Wait for Grafana to be ready
-    max_retries = 5
-    for attempt in range(max_retries):
-        try:
-            # First check if Prometheus datasource exists
-            response = requests.get(
-                f"http://{ip}:3000/api/datasources",
-                headers=headers,
-                auth=auth
-            )
-            response.raise_for_status()
-            
-            # Look for existing Prometheus datasource
-            datasources = response.json()
-            for ds in datasources:
-                if ds["type"] == "prometheus":
-                    click.echo("Found existing Prometheus datasource")
-                    return ds["uid"]
-            
-            # If we get here, no Prometheus found - let's create it
-            click.echo("Creating Prometheus datasource...")
-            datasource_payload = {
-                "name": "Prometheus",
-                "type": "prometheus",
-                "url": "http://prometheus:9090",
-                "access": "proxy",
-                "isDefault": True,
-                "jsonData": {
-                    "timeInterval": "15s"
-                }
+    session = grafana_session()
+
+    try:
+        # First check if Prometheus datasource exists
+        response = session.get(
+            f"http://{ip}:3000/api/datasources",
+            headers=headers,
+            auth=auth,
+            timeout=GRAFANA_TIMEOUT
+        )
+        response.raise_for_status()
+        
+        # Look for existing Prometheus datasource
+        datasources = response.json()
+        for ds in datasources:
+            if ds["type"] == "prometheus":
+                click.echo("Found existing Prometheus datasource")
+                return ds["uid"]
+        
+        # If we get here, no Prometheus found - let's create it
+        click.echo("Creating Prometheus datasource...")
+        datasource_payload = {
+            "name": "Prometheus",
+            "type": "prometheus",
+            "url": "http://prometheus:9090",
+            "access": "proxy",
+            "isDefault": True,
+            "jsonData": {
+                "timeInterval": "15s"
             }
-            
-            create_response = requests.post(
-                f"http://{ip}:3000/api/datasources",
-                headers=headers,
-                auth=auth,
-                json=datasource_payload
-            )
-            create_response.raise_for_status()
-            
-            new_datasource = create_response.json()
-            click.echo("Prometheus datasource created successfully")
-            return new_datasource["datasource"]["uid"]
-            
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise Exception("Failed to setup Prometheus datasource after multiple attempts") from e
-            click.echo(f"Attempt {attempt + 1}: Waiting for Grafana API...")
-            time.sleep(10)
-            
-    raise Exception("Could not setup Prometheus datasource")
+        }
+        
+        create_response = session.post(
+            f"http://{ip}:3000/api/datasources",
+            headers=headers,
+            auth=auth,
+            data=dump_json(datasource_payload),
+            timeout=GRAFANA_TIMEOUT
+        )
+        create_response.raise_for_status()
+        
+        new_datasource = create_response.json()
+        click.echo("Prometheus datasource created successfully")
+        return new_datasource["datasource"]["uid"]
+        
+    except requests.RequestException as e:
+        raise Exception("Failed to setup Prometheus datasource") from e
 
 @cli.command() 
 def rollback():
+    from .aws import rollback_all_resources
     rollback_all_resources()
     click.echo("Full rollback complete.")
 
@@ -1,25 +1,94 @@
 import os
 import json
+import functools
+import threading
 from pathlib import Path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Every AWS resource the tool creates lives here
+REGION = "ap-south-1"
 
 CONFIG_PATH = Path.home() / ".deploy_tool_config.json"
 
 def save_config(config):
-    with open(CONFIG_PATH, 'w') as f:
-        json.dump(config, f)
+    write_json(CONFIG_PATH, config)
 
 def load_config():
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH) as f:
-            return json.load(f)
-    return None
+    return read_json_cached(CONFIG_PATH)
+
+
+def read_json(path):
+    # Parsing the raw bytes skips the text decode layer and lets orjson take over when installed
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def dump_json(data):
+    """Serialize to UTF-8 bytes, with orjson when installed."""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode()
+
+def write_json(path, data):
+    """Write to a sibling temp file and rename it over path, so readers never see a partial file."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dump_json(data))
+        # Make the contents durable before the rename, or a crash can leave an empty file behind
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+@functools.lru_cache(maxsize=4)
+def _read_json_for_stat(path, inode, mtime_ns, size):
+    return read_json(path)
+
+def read_json_cached(path):
+    """
+    Parse a state file once per version of it; None if it doesn't exist.
+    write_json renames a new file into place, so any write changes the key.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _read_json_for_stat(os.path.abspath(path), st.st_ino, st.st_mtime_ns, st.st_size)
 
 
 # Extra state file for bucket metadata
 CONFIG_FILE = Path("bucket.json")
+# Environments are published concurrently and all write bucket.json
+_bucket_config_lock = threading.Lock()
 
 def load_bucket_config():
-    if not CONFIG_FILE.exists():
+    return read_json_cached(CONFIG_FILE)
+
+def save_bucket_config(bucket_name, region=REGION, environment=None, website_enabled=False):
+    """Persist the *last deployed* bucket, and each env's bucket under "environments"."""
+    entry = {"bucket": bucket_name, "region": region}
+    if website_enabled:
+        entry["website_enabled"] = True
+
+    with _bucket_config_lock:
+        state = load_bucket_config() or {}
+        # Copy: the cached state is shared and must not be modified
+        environments = dict(state.get("environments", {}))
+        data = dict(entry)
+        if environment:
+            data["env"] = environment
+            environments[environment] = entry
+        if environments:
+            data["environments"] = environments
+        write_json(CONFIG_FILE, data)
+
+def get_env_bucket_config(state, environment):
+    """The bucket entry saved for an environment, if any."""
+    if not state:
         return None
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    if environment in state.get("environments", {}):
+        return state["environments"][environment]
+    # bucket.json written before per-env entries existed
+    if state.get("env") == environment:
+        return state
+    return None
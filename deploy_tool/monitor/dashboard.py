@@ -1,6 +1,6 @@
 import webbrowser
 import os
-import json
+from deploy_tool.config import read_json
 
 CONFIG_PATH = os.path.expanduser("~/.deploy_tool/monitoring_config.json")
 
@@ -9,8 +9,7 @@ def show_monitoring_dashboard():
         print("❌ Monitoring not initialized. Run: deploy-tool monitor init")
         return
 
-    with open(CONFIG_PATH, 'r') as f:
-        config = json.load(f)
+    config = read_json(CONFIG_PATH)
 
     s3_exists = config.get("s3_monitoring", False)
     ec2_ip = config.get("ec2_monitor_ip")
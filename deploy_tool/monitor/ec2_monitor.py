@@ -1,54 +1,28 @@
-import boto3
-import time
-import json
+import functools
+import gzip
 import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from deploy_tool.config import REGION, read_json_cached, write_json
 from deploy_tool.monitor.monitor_config import KEY_PATH  # assuming KEY_PATH is used elsewhere or future
+from deploy_tool.monitor.monitor_config import CONFIG_PATH, GRAFANA_PORT, MONITOR_INSTANCE_NAME, PROMETHEUS_PORT, get_ec2_resource
 
-REGION = "ap-south-1"
-AMI_ID = "ami-0b09627181c8d5778"
-CONFIG_PATH = Path.home() / ".deploy_tool" / "monitor_instance.json"
-
-def provision_monitoring_instance(instance_type):
-    ec2 = boto3.resource("ec2", region_name=REGION)
-
-    # Create security group
-    sg = ec2.create_security_group(
-        GroupName="monitoring-sg",
-        Description="Allow Grafana and Prometheus ports"
-    )
-
-    sg.authorize_ingress(IpPermissions=[
-        {
-            'IpProtocol': 'tcp',
-            'FromPort': 22,
-            'ToPort': 22,
-            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]
-        },
-        {
-            'IpProtocol': 'tcp',
-            'FromPort': 3000,
-            'ToPort': 3000,
-            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]  # Grafana
-        },
-        {
-            'IpProtocol': 'tcp',
-            'FromPort': 9090,
-            'ToPort': 9090,
-            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]  # Prometheus
-        },
-        {
-            'IpProtocol': 'tcp',
-            'FromPort': 9100,
-            'ToPort': 9100,
-            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]  # Node Exporter
-        }
-    ])
+# Public SSM parameter with the latest Amazon Linux 2023 AMI; AMI ids differ per region
+AMI_PARAMETER = "/aws/service/ami-amazon-linux-latest/al2023-ami-kernel-default-x86_64"
+SECURITY_GROUP_NAME = "monitoring-sg"
+# Shared by every stack in a batch: a broken boot script costs this long once, not per instance
+STACK_TIMEOUT = 600
+STACK_WAIT_WORKERS = 8
 
-    user_data_script = """#!/bin/bash
+USER_DATA_HEADER = """#!/bin/bash
 exec > /var/log/user-data.log 2>&1
 
-# Update and install Docker, Git, Docker Compose
+"""
+
+INSTALL_DOCKER_SCRIPT = """# Update and install Docker, Git, Docker Compose
 yum update -y
 yum install -y docker git
 
@@ -63,7 +37,15 @@ systemctl start docker
 systemctl enable docker
 usermod -aG docker ec2-user
 
-# Prepare app directory
+"""
+
+# For AMIs that already have docker and docker-compose installed
+START_DOCKER_SCRIPT = """# Start Docker service
+systemctl start docker
+
+"""
+
+MONITORING_STACK_SCRIPT = """# Prepare app directory
 mkdir -p /opt/monitoring
 cd /opt/monitoring
 
@@ -147,55 +129,231 @@ modules:
 EOF
 
 # Wait for Docker to be ready
-sleep 10
+until docker info > /dev/null 2>&1; do sleep 1; done
 
 # Run all services
 docker-compose up -d
 """
 
-    instance = ec2.create_instances(
-        ImageId=AMI_ID,
-        InstanceType=instance_type,
-        KeyName="livanshu-kp",
-        MinCount=1,
-        MaxCount=1,
-        SecurityGroupIds=[sg.id],
-        UserData=user_data_script
-    )[0]
+# AMI with docker and docker-compose baked in; skips the package installs on first boot
+MONITOR_AMI_ID = os.environ.get("DEPLOY_TOOL_MONITOR_AMI")
+
+# Optional instance profile (e.g. a role with AmazonSSMManagedInstanceCore) so the
+# instance can be reached through SSM Session Manager; the key pair stays for break-glass SSH
+MONITOR_INSTANCE_PROFILE = os.environ.get("DEPLOY_TOOL_MONITOR_INSTANCE_PROFILE")
+
+@functools.lru_cache(maxsize=None)
+def resolve_ami_id(region=REGION):
+    """Latest Amazon Linux AMI id for the region, looked up once per region."""
+    from deploy_tool.aws import get_ssm_client
+    return get_ssm_client(region).get_parameter(Name=AMI_PARAMETER)["Parameter"]["Value"]
+
+@functools.lru_cache(maxsize=1)
+def monitoring_user_data():
+    """
+    Gzipped boot script, built once. cloud-init unpacks gzipped user data
+    itself; this sends about a third of the bytes.
+    """
+    setup = START_DOCKER_SCRIPT if MONITOR_AMI_ID else INSTALL_DOCKER_SCRIPT
+    script = USER_DATA_HEADER + setup + MONITORING_STACK_SCRIPT
+    return gzip.compress(script.encode(), mtime=0)
+
+def find_monitoring_security_group(ec2):
+    """
+    The security group a previous run created, or None. The saved id is
+    tried first, then the group name (create fails on a duplicate name).
+    """
+    from botocore.exceptions import ClientError
+    client = ec2.meta.client
+    saved_id = (read_json_cached(CONFIG_PATH) or {}).get("security_group_id")
+    if saved_id:
+        try:
+            client.describe_security_groups(GroupIds=[saved_id])
+            return ec2.SecurityGroup(saved_id)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "InvalidGroup.NotFound":
+                raise
+
+    groups = client.describe_security_groups(
+        Filters=[{"Name": "group-name", "Values": [SECURITY_GROUP_NAME]}]
+    )["SecurityGroups"]
+    return ec2.SecurityGroup(groups[0]["GroupId"]) if groups else None
+
+def wait_for_public_ips(ec2_client, instance_ids, timeout=300):
+    """
+    Poll until every instance has a public IP, which is all the next steps need.
+    One describe call covers all the instances, and unlike wait_until_running
+    (15s between checks) this returns within a second or so of the addresses
+    being assigned. IPs are returned in the order of instance_ids.
+    """
+    from botocore.exceptions import ClientError
+    deadline = time.time() + timeout
+    delay = 1
+    ips = {}
+    while time.time() < deadline:
+        try:
+            reservations = ec2_client.describe_instances(InstanceIds=instance_ids)["Reservations"]
+        except ClientError as e:
+            # A just-created instance can briefly be unknown to describe calls
+            if e.response["Error"]["Code"] != "InvalidInstanceID.NotFound":
+                raise
+            reservations = []
+        for reservation in reservations:
+            for instance in reservation["Instances"]:
+                state = instance["State"]["Name"]
+                if state not in ("pending", "running"):
+                    raise RuntimeError(f"Monitoring instance {instance['InstanceId']} is {state}")
+                if instance.get("PublicIpAddress"):
+                    ips[instance["InstanceId"]] = instance["PublicIpAddress"]
+        if len(ips) == len(instance_ids):
+            return [ips[instance_id] for instance_id in instance_ids]
+        time.sleep(delay)
+        delay = min(3, delay * 1.5)
+    missing = [instance_id for instance_id in instance_ids if instance_id not in ips]
+    raise TimeoutError(f"Timed out waiting for a public IP on {', '.join(missing)}")
+
+def wait_for_http(url, deadline):
+    """Poll a health endpoint until it answers 200. Returns False if the deadline passes first."""
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(2)
+    return False
+
+def wait_for_monitoring_stack(public_ip, deadline):
+    """
+    Return once Prometheus and Grafana answer their health checks. First boot
+    installs Docker and pulls the images, so this can take a few minutes.
+    """
+    checks = [
+        ("Prometheus", f"http://{public_ip}:{PROMETHEUS_PORT}/-/ready"),
+        ("Grafana", f"http://{public_ip}:{GRAFANA_PORT}/api/health"),
+    ]
+    for name, url in checks:
+        if not wait_for_http(url, deadline):
+            print(f"⚠️ {name} on {public_ip} is not answering yet; it may still be starting (see /var/log/user-data.log).")
+            return False
+        print(f" {name} on {public_ip} is ready.")
+    return True
+
+def wait_for_monitoring_stacks(public_ips, timeout=STACK_TIMEOUT):
+    """Poll every stack at once against one shared deadline."""
+    print(" Waiting for Prometheus and Grafana to start...")
+    deadline = time.time() + timeout
+    with ThreadPoolExecutor(max_workers=min(STACK_WAIT_WORKERS, len(public_ips))) as executor:
+        return all(executor.map(lambda public_ip: wait_for_monitoring_stack(public_ip, deadline), public_ips))
+
+def create_monitoring_security_group(ec2):
+    sg = ec2.create_security_group(
+        GroupName=SECURITY_GROUP_NAME,
+        Description="Allow Grafana and Prometheus ports",
+        TagSpecifications=[{
+            'ResourceType': 'security-group',
+            'Tags': [{'Key': 'Name', 'Value': SECURITY_GROUP_NAME}]
+        }]
+    )
 
-    print(" Waiting for instance to run...")
-    instance.wait_until_running()
-    instance.reload()
+    sg.authorize_ingress(IpPermissions=[
+        {
+            'IpProtocol': 'tcp',
+            'FromPort': 22,
+            'ToPort': 22,
+            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]
+        },
+        {
+            'IpProtocol': 'tcp',
+            'FromPort': 3000,
+            'ToPort': 3000,
+            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]  # Grafana
+        },
+        {
+            'IpProtocol': 'tcp',
+            'FromPort': 9090,
+            'ToPort': 9090,
+            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]  # Prometheus
+        },
+        {
+            'IpProtocol': 'tcp',
+            'FromPort': 9100,
+            'ToPort': 9100,
+            'IpRanges': [{'CidrIp': '0.0.0.0/0'}]  # Node Exporter
+        }
+    ])
+    return sg
 
-    # Optional tag for easier lookup
-    instance.create_tags(Tags=[{"Key": "Name", "Value": "monitoring-instance"}])
+def provision_monitoring_instance(instance_type, count=1):
+    ec2 = get_ec2_resource()
 
-    public_ip = instance.public_ip_address
+    # The AMI lookup doesn't depend on the security group, so it runs alongside
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        ami_lookup = None if MONITOR_AMI_ID else executor.submit(resolve_ami_id)
 
-    print(f"✅ Monitoring stack deployed!")
-    print(f"Grafana: http://{public_ip}:3000")
-    print(f"Prometheus: http://{public_ip}:9090")
+        sg = find_monitoring_security_group(ec2)
+        if sg:
+            print(f" Reusing security group {sg.id}")
+        else:
+            sg = create_monitoring_security_group(ec2)
 
+        image_id = MONITOR_AMI_ID or ami_lookup.result()
 
-    # Save metadata to config
-    CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_PATH, "w") as f:
-        json.dump({
-            "instance_id": instance.id,
-            "public_ip": public_ip,
-            "grafana_port": 3000,
-            "prometheus_port": 9090
-        }, f, indent=2)
+    launch_args = {}
+    if MONITOR_INSTANCE_PROFILE:
+        key = "Arn" if MONITOR_INSTANCE_PROFILE.startswith("arn:") else "Name"
+        launch_args["IamInstanceProfile"] = {key: MONITOR_INSTANCE_PROFILE}
 
-    print(f"📦 Metadata saved to: {CONFIG_PATH}")
+    # One run_instances call launches the whole batch
+    instances = ec2.create_instances(
+        ImageId=image_id,
+        InstanceType=instance_type,
+        KeyName="livanshu-kp",
+        MinCount=count,
+        MaxCount=count,
+        SecurityGroupIds=[sg.id],
+        UserData=monitoring_user_data(),
+        # Tagged at launch instead of a separate create_tags call; the name is
+        # what get_monitor_instance_ip looks the instance up by
+        TagSpecifications=[{
+            'ResourceType': 'instance',
+            'Tags': [{'Key': 'Name', 'Value': MONITOR_INSTANCE_NAME}]
+        }],
+        **launch_args
+    )
+    instance_ids = [instance.id for instance in instances]
 
-    metadata_file = os.path.expanduser("~/.deploy_tool/monitor.json")
-    os.makedirs(os.path.dirname(metadata_file), exist_ok=True)
+    print(" Waiting for instance to run..." if count == 1 else f" Waiting for {count} instances to run...")
+    public_ips = wait_for_public_ips(ec2.meta.client, instance_ids)
 
-    with open(metadata_file, "w") as f:
-        json.dump({
+    stacks = []
+    for instance_id, public_ip in zip(instance_ids, public_ips):
+        stacks.append({
+            "instance_id": instance_id,
+            "public_ip": public_ip,
             "grafana_url": f"http://{public_ip}:3000",
             "prometheus_url": f"http://{public_ip}:9090"
-        }, f)
+        })
+
+    print(f"✅ Monitoring stack deployed!")
+    for stack in stacks:
+        print(f"Grafana: {stack['grafana_url']}")
+        print(f"Prometheus: {stack['prometheus_url']}")
+
+
+    # Save metadata to config; the one file every monitor command reads.
+    # The first stack stays at the top level, which is what the dashboard
+    # commands use; "instances" lists the whole batch.
+    Path(CONFIG_PATH).parent.mkdir(parents=True, exist_ok=True)
+    write_json(CONFIG_PATH, {
+        **stacks[0],
+        "security_group_id": sg.id,
+        "grafana_port": 3000,
+        "prometheus_port": 9090,
+        "instances": stacks
+    })
+
+    print(f"📦 Metadata saved to: {CONFIG_PATH}")
 
-    print(f"🔗 Grafana URL stored in {metadata_file}")
+    wait_for_monitoring_stacks(public_ips)
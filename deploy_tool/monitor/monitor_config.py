@@ -1,9 +1,7 @@
 # monitor_config.py
 import os
-import json
-import boto3
+from deploy_tool.config import REGION, read_json_cached
 
-REGION = "ap-south-1"
 KEY_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'livanshu-kp.pem'))
 
 MONITOR_INSTANCE_NAME = "monitoring-ec2"
@@ -13,41 +11,72 @@ GRAFANA_PORT = 3000
 CONFIG_PATH = os.path.expanduser("~/.deploy_tool/monitor_instance.json")
 BUCKET_JSON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'bucket.json'))
 
+def get_ec2_resource():
+    """
+    The same cached EC2 resource the deploy commands use. Imported on first
+    use so commands that only read saved metadata don't load boto3.
+    """
+    from deploy_tool.aws import get_ec2_resource as get_shared_ec2_resource
+    return get_shared_ec2_resource()
+
 def get_monitor_instance_config():
     """
     Load monitor metadata saved during `monitor init`
+    (parsed once per version of the file)
     """
-    if not os.path.exists(CONFIG_PATH):
+    config = read_json_cached(CONFIG_PATH)
+    if config is None:
         raise FileNotFoundError(f"No monitoring instance config found at {CONFIG_PATH}")
-    
-    with open(CONFIG_PATH, "r") as f:
-        return json.load(f)
+    return config
 
 def get_monitor_instance_ip():
     """
-    Legacy fallback to retrieve public IP via EC2 tags (not preferred anymore)
+    Public IP saved by `monitor init`. Without a saved IP the saved instance
+    id is described directly; the Name tag filter is the last resort when
+    no metadata is saved at all.
     """
-    ec2 = boto3.resource('ec2', region_name=REGION)
+    try:
+        config = get_monitor_instance_config()
+    except FileNotFoundError:
+        config = {}
+    if config.get("public_ip"):
+        return config["public_ip"]
+
+    ec2 = get_ec2_resource()
+    if config.get("instance_id"):
+        from botocore.exceptions import ClientError
+        try:
+            reservations = ec2.meta.client.describe_instances(
+                InstanceIds=[config["instance_id"]]
+            )["Reservations"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "InvalidInstanceID.NotFound":
+                raise
+            reservations = []
+        if reservations:
+            return reservations[0]["Instances"][0].get("PublicIpAddress")
+
     instances = ec2.instances.filter(
         Filters=[
             {'Name': 'tag:Name', 'Values': [MONITOR_INSTANCE_NAME]},
             {'Name': 'instance-state-name', 'Values': ['running']}
         ]
-    )
-    for instance in instances:
-        return instance.public_ip_address
-    return None
+    ).limit(1)
+    instance = next(iter(instances), None)
+    return instance.public_ip_address if instance else None
 
 def get_s3_dashboard_url():
     """
-    Reads the bucket.json to construct the public S3 website URL for dashboard access.
+    Reads the bucket.json to construct the public S3 website URL for dashboard access
+    (parsed once per version of the file)
     """
     try:
-        with open(BUCKET_JSON_PATH, 'r') as f:
-            data = json.load(f)
-            bucket = data['bucket']
-            region = data.get('region', REGION)
-            return f"http://{bucket}.s3-website.{region}.amazonaws.com"
+        data = read_json_cached(BUCKET_JSON_PATH)
+        if data is None:
+            raise FileNotFoundError(f"{BUCKET_JSON_PATH} not found")
+        bucket = data['bucket']
+        region = data.get('region', REGION)
+        return f"http://{bucket}.s3-website.{region}.amazonaws.com"
     except Exception as e:
         print(f"⚠️ Error reading bucket.json: {e}")
         return None
@@ -5,10 +5,12 @@ setup(
     version='0.1',
     packages=find_packages(),
     install_requires=[
-        'boto3',
+        'boto3>=1.26',
         'click',
         'paramiko',
-        'scp'
+        'scp',
+        'requests',
+        'orjson'
     ],
     entry_points={
         'console_scripts': [